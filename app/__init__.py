@@ -14,8 +14,9 @@ def create_app(config_class=Config):
     app.debug = True
     app.config.from_object(config_class)
 
-    from app.routes import main, update_url_params
+    from app.routes import main, update_url_params, close_db
     app.register_blueprint(main)
+    app.teardown_appcontext(close_db)
     app.template_filter('update_url_params')(update_url_params)
 
     # Add built-in functions to Jinja environment
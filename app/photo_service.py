@@ -25,7 +25,7 @@ def get_db_path():
 @contextmanager
 def get_db():
     """Database connection context manager"""
-    conn = sqlite3.connect(get_db_path())
+    conn = sqlite3.connect(get_db_path(), uri=True)
     conn.row_factory = sqlite3.Row  # Enable dict-like access to rows
     conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign key constraints
     try:
@@ -82,6 +82,34 @@ class PhotoService:
             conn.commit()
             return cursor.lastrowid
     
+    @staticmethod
+    def bulk_create_photo_records(records: List[Dict]) -> List[int]:
+        """
+        Create several photo records in one transaction
+        Each record has the create_photo_record arguments as keys (uploader_metadata optional)
+        Returns the photo IDs in the same order as the records
+        """
+        with get_db() as conn:
+            cursor = conn.cursor()
+            photo_ids = []
+            try:
+                # One INSERT statement, prepared once and reused for every row
+                for record in records:
+                    cursor.execute("""
+                        INSERT INTO game_photos (
+                            s3_bucket, s3_key, original_filename, file_size, 
+                            mime_type, uploader_metadata, is_active
+                        ) VALUES (?, ?, ?, ?, ?, ?, 1)
+                    """, (record['s3_bucket'], record['s3_key'], record['original_filename'],
+                          record['file_size'], record['mime_type'], record.get('uploader_metadata')))
+                    photo_ids.append(cursor.lastrowid)
+                
+                conn.commit()
+                return photo_ids
+            except Exception:
+                conn.rollback()
+                raise
+    
     @staticmethod
     def associate_photo_with_game(physical_game_id: int, game_photo_id: int, 
                                 photo_order: Optional[int] = None) -> bool:
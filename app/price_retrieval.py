@@ -1,11 +1,15 @@
 import sqlite3
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import datetime
 from typing import Optional, Dict, Any, Union
 from flask import current_app
 
 
+# Only the three price cells are parsed; the rest of the page is skipped
+PRICE_CELLS = SoupStrainer(id=['complete_price', 'new_price', 'used_price'])
+
+
 def extract_price(document: BeautifulSoup, selector: str) -> Optional[float]:
     """Extract price from HTML document using CSS selector."""
     if price_element := document.select_one(selector):
@@ -25,7 +29,7 @@ def get_game_prices(pricecharting_id: str) -> Optional[Dict[str, Any]]:
         current_app.logger.info(f"Fetching prices from: {url}")
         response = requests.get(url, timeout=10)
         response.raise_for_status()
-        document = BeautifulSoup(response.content, 'html.parser')
+        document = BeautifulSoup(response.content, 'html.parser', parse_only=PRICE_CELLS)
 
         # Use UTC time explicitly
         current_time = datetime.datetime.now(datetime.timezone.utc).isoformat()
@@ -71,7 +75,7 @@ def insert_price_records(price_data: Dict[str, Any], connection: Union[str, sqli
     
     try:
         if isinstance(connection, str):
-            with sqlite3.connect(connection) as conn:
+            with sqlite3.connect(connection, uri=True) as conn:
                 conn.execute("PRAGMA foreign_keys = ON")
                 conn.executemany("""
                     INSERT INTO pricecharting_prices 
@@ -101,7 +105,7 @@ def update_game_prices(game_id: int, connection: Union[str, sqlite3.Connection])
     try:
         # Get the pricecharting_id for this game
         if isinstance(connection, str):
-            conn = sqlite3.connect(connection)
+            conn = sqlite3.connect(connection, uri=True)
         else:
             conn = connection
             
@@ -143,7 +147,7 @@ def get_last_price_update(game_id: int, connection: Union[str, sqlite3.Connectio
     """Get the date of the last price update for a game."""
     try:
         if isinstance(connection, str):
-            conn = sqlite3.connect(connection)
+            conn = sqlite3.connect(connection, uri=True)
         else:
             conn = connection
             
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, render_template, jsonify, current_app
+from flask import Blueprint, request, render_template, jsonify, current_app, g
 from werkzeug.datastructures import MultiDict
 from urllib.parse import urlencode
 from contextlib import contextmanager
@@ -18,11 +18,24 @@ def get_db_path():
 
 @contextmanager
 def get_db():
-    conn = sqlite3.connect(get_db_path())
+    """
+    Yield the app context's database connection, opening it on first use so every get_db()
+    in a request shares one connection; close_db() closes it when the context ends.
+    Uncommitted changes are rolled back if the block raises.
+    """
+    if 'db' not in g:
+        g.db = sqlite3.connect(get_db_path(), uri=True)
     try:
-        yield conn
-    finally:
-        conn.close()
+        yield g.db
+    except Exception:
+        g.db.rollback()
+        raise
+
+def close_db(exception=None):
+    """Close the app context's database connection, if get_db() opened one"""
+    db = g.pop('db', None)
+    if db is not None:
+        db.close()
 
 # Helper function for updating URL parameters
 def update_url_params(args, **kwargs):
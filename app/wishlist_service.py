@@ -21,7 +21,7 @@ class WishlistService:
     @contextmanager
     def get_db_connection(self):
         """Get a database connection."""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=True)
         try:
             yield conn
         finally:
@@ -59,7 +59,9 @@ class WishlistService:
         with self.get_db_connection() as conn:
             cursor = conn.cursor()
             try:
-                conn.execute("BEGIN TRANSACTION")
+                # Take the write lock up front; a deferred transaction that reads
+                # first fails with "database is locked" if another add is writing
+                conn.execute("BEGIN IMMEDIATE")
                 
                 # Check if game already exists in pricecharting_games table
                 cursor.execute(
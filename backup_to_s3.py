@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Database backup script for collecting-website.
-Uploads the games.db file to S3 for backup purposes.
+Uploads a consistent snapshot of the games.db file to S3 for backup purposes.
 Based on the publish_to_s3 functionality from the collecting-tools CLI.
 """
 
@@ -10,7 +10,9 @@ import boto3
 from datetime import datetime
 import logging
 import os
+import sqlite3
 import sys
+import tempfile
 from pathlib import Path
 
 
@@ -27,6 +29,25 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 
+def snapshot_database(db_path: str, snapshot_path: str):
+    """
+    Copy the database to snapshot_path with SQLite's online backup API.
+    
+    The database runs in WAL mode, so recent commits may still be in games.db-wal
+    rather than games.db; copying the main file alone could lose them or catch a
+    half-written page. The backup API reads through SQLite and includes both.
+    """
+    source = sqlite3.connect(db_path)
+    try:
+        snapshot = sqlite3.connect(snapshot_path)
+        try:
+            source.backup(snapshot)
+        finally:
+            snapshot.close()
+    finally:
+        source.close()
+
+
 def backup_database(db_path: str, bucket: str = "collecting-tools-gantt-pub", key: str = "games.db"):
     """
     Backup the SQLite database to S3.
@@ -44,22 +65,27 @@ def backup_database(db_path: str, bucket: str = "collecting-tools-gantt-pub", ke
         if not db_file.exists():
             raise FileNotFoundError(f"Database file not found: {db_path}")
         
-        # Get file size for logging
-        file_size = db_file.stat().st_size
-        logger.info(f"Backing up database: {db_path} ({file_size:,} bytes)")
-        
-        # Initialize S3 client
-        s3 = boto3.client('s3')
-        
-        # Upload file to S3
-        logger.info(f"Uploading to s3://{bucket}/{key}...")
-        s3.upload_file(str(db_path), bucket, key)
-        
-        # Also create a timestamped backup for historical purposes
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        timestamped_key = f"backups/games_{timestamp}.db"
-        logger.info(f"Creating timestamped backup: s3://{bucket}/{timestamped_key}")
-        s3.upload_file(str(db_path), bucket, timestamped_key)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Upload a snapshot rather than the live file, which may be missing WAL commits
+            snapshot_path = os.path.join(tmp_dir, db_file.name)
+            snapshot_database(str(db_file), snapshot_path)
+            
+            # Get file size for logging
+            file_size = Path(snapshot_path).stat().st_size
+            logger.info(f"Backing up database: {db_path} ({file_size:,} bytes)")
+            
+            # Initialize S3 client
+            s3 = boto3.client('s3')
+            
+            # Upload file to S3
+            logger.info(f"Uploading to s3://{bucket}/{key}...")
+            s3.upload_file(snapshot_path, bucket, key)
+            
+            # Also create a timestamped backup for historical purposes
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamped_key = f"backups/games_{timestamp}.db"
+            logger.info(f"Creating timestamped backup: s3://{bucket}/{timestamped_key}")
+            s3.upload_file(snapshot_path, bucket, timestamped_key)
         
         logger.info("Database backup completed successfully!")
         return True
@@ -8,7 +8,7 @@ information for the game collection. It uses a controlled batch size to ensure
 consistent server load and avoid overwhelming external APIs.
 
 Usage:
-    python3 daily_price_update.py [--batch-size N] [--verbose]
+    python3 daily_price_update.py [--batch-size N] [--rate R] [--verbose]
     
 Environment Variables:
     PRICE_BATCH_SIZE: Override default batch size (default: 50)
@@ -20,60 +20,144 @@ import os
 import sqlite3
 import argparse
 import logging
+import re
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Tuple, Optional
 import time
 
+import requests
+from lxml import etree, html
+from urllib3.util import make_headers
+
 # Add the app directory to the path so we can import price_retrieval
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+def _price_xpath(element_id: str) -> etree.XPath:
+    """Compile the XPath for '#<element_id> > span.price.js-price'."""
+    has_class = 'contains(concat(" ", normalize-space(@class), " "), " {} ")'
+    return etree.XPath(
+        f'//*[@id="{element_id}"]/span[{has_class.format("price")} and {has_class.format("js-price")}]'
+    )
+
+# Compiled once at import; each page only runs these three lookups
+PRICE_XPATHS = {
+    'complete': _price_xpath('complete_price'),
+    'new': _price_xpath('new_price'),
+    'loose': _price_xpath('used_price')
+}
+
+PRICE_RE = re.compile(r'\d[\d,]*\.?\d*')
+
+def extract_price(text: str) -> Optional[float]:
+    """Convert a PriceCharting price string such as '$1,234.56' or '-' to a float."""
+    match = PRICE_RE.search(text)
+    return float(match.group().replace(',', '')) if match else None
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting requests to `rate` per second on average,
+    with bursts of up to `capacity` requests.
+    """
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request may be made."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def parse_game_prices(content: bytes) -> dict:
+    """
+    Parse the complete/new/loose prices out of a PriceCharting game page.
+    
+    Kept separate from fetching so the CPU-bound parse can be run and timed
+    on its own, independent of the network.
+    """
+    document = html.fromstring(content)
+    prices = {}
+    for condition, xpath in PRICE_XPATHS.items():
+        elements = xpath(document)
+        prices[condition] = extract_price(elements[0].text_content()) if elements else None
+    return prices
+
+def create_session() -> requests.Session:
+    """
+    Create the HTTP session shared by every request in a run.
+    
+    Compressed responses are requested explicitly; urllib3 only advertises
+    Brotli (br) when the brotli package is installed and it can decode it.
+    """
+    session = requests.Session()
+    session.headers.update(make_headers(accept_encoding=True, user_agent=USER_AGENT))
+    return session
+
 # Import price retrieval functions directly to avoid Flask dependency issues
 # when running as standalone script
-def get_game_prices(pricecharting_id: str):
-    """Import at runtime to avoid Flask dependency when running standalone."""
-    import requests
-    from bs4 import BeautifulSoup
-    from datetime import datetime, timezone
+def get_game_prices(pricecharting_id: str, session: requests.Session,
+                    validators: Optional[Tuple[str, str]] = None,
+                    rate_limiter: Optional[TokenBucket] = None):
+    """
+    Fetch and parse a game's PriceCharting page.
     
+    session is shared across the run so the TLS connection to PriceCharting
+    is kept alive between games instead of being set up for every request.
+    validators is the (etag, last_modified) pair from the previous fetch. When
+    PriceCharting answers 304 Not Modified the page is not downloaded or
+    parsed, and the result has 'not_modified' set instead of 'prices'.
+    """
     url = f"https://www.pricecharting.com/game/{pricecharting_id}"
     
+    headers = {}
+    if validators:
+        etag, last_modified = validators
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+    
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        document = BeautifulSoup(response.content, 'html.parser')
-        
+        if rate_limiter:
+            rate_limiter.acquire()
+        response = session.get(url, headers=headers, timeout=10)
         current_time = datetime.now(timezone.utc).isoformat()
         
-        def extract_price(selector):
-            if element := document.select_one(selector):
-                text = element.text.strip()
-                if text.startswith('$'):
-                    text = text[1:]
-                text = text.replace(',', '')
-                return None if text == '-' else float(text)
-            return None
+        if response.status_code == 304:
+            return {
+                'time': current_time,
+                'pricecharting_id': pricecharting_id,
+                'not_modified': True
+            }
         
-        prices = {
-            'complete': extract_price('#complete_price > span.price.js-price'),
-            'new': extract_price('#new_price > span.price.js-price'),
-            'loose': extract_price('#used_price > span.price.js-price')
-        }
+        response.raise_for_status()
         
         return {
             'time': current_time,
             'pricecharting_id': pricecharting_id,
-            'prices': prices
+            'prices': parse_game_prices(response.content),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
         }
     except Exception as e:
         print(f"Error retrieving prices for {pricecharting_id}: {e}")
         return None
 
-def insert_price_records(price_data: dict, connection):
-    """Insert price records into the database."""
-    if not price_data:
-        return False
-    
+def build_price_records(price_data: dict) -> List[Tuple]:
+    """Build the pricecharting_prices rows for one game's price data."""
     records = []
     has_prices = False
     
@@ -86,24 +170,58 @@ def insert_price_records(price_data: dict, connection):
     if not has_prices:
         records.append((price_data['pricecharting_id'], price_data['time'], None, 'new'))
     
+    return records
+
+def insert_price_records(records: List[Tuple], validators: List[Tuple], connection: sqlite3.Connection) -> bool:
+    """
+    Insert all price records for the run in one transaction.
+    
+    The HTTP validators are saved in the same transaction so a cached ETag
+    never refers to a page whose prices were not stored.
+    """
     try:
-        connection.execute("PRAGMA foreign_keys = ON")
+        for start in range(0, len(records), INSERT_CHUNK_SIZE):
+            connection.executemany("""
+                INSERT INTO pricecharting_prices 
+                (pricecharting_id, retrieve_time, price, condition)
+                VALUES (?,?,?,?)
+            """, records[start:start + INSERT_CHUNK_SIZE])
         connection.executemany("""
-            INSERT INTO pricecharting_prices 
-            (pricecharting_id, retrieve_time, price, condition)
-            VALUES (?,?,?,?)
-        """, records)
+            INSERT INTO pricecharting_http_cache (pricecharting_id, etag, last_modified)
+            VALUES (?,?,?)
+            ON CONFLICT (pricecharting_id) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified
+        """, validators)
         connection.commit()
         return True
     except Exception as e:
+        connection.rollback()
         print(f"Error inserting price records: {e}")
         return False
 
 # Configuration
 DEFAULT_BATCH_SIZE = 200
+DEFAULT_REQUEST_RATE = 1.0  # Requests per second to PriceCharting
+REQUEST_BURST = 4
+INSERT_CHUNK_SIZE = 500
+USER_AGENT = 'collecting-website/1.0'
 DEFAULT_DB_PATH = Path(__file__).parent / "games.db"
 LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 
+ELIGIBLE_GAMES_QUERY = """
+    SELECT game_id, name, console, pricecharting_id
+    FROM eligible_price_updates
+    LIMIT ?
+"""
+
+ELIGIBLE_GAMES_COUNT_QUERY = """
+    SELECT COUNT(*)
+    FROM (SELECT game_id FROM eligible_price_updates LIMIT ?)
+"""
+
+DRY_RUN_PREVIEW_SIZE = 10
+
 def setup_logging(verbose: bool = False) -> logging.Logger:
     """Configure logging for the script."""
     level = logging.DEBUG if verbose else logging.INFO
@@ -135,7 +253,66 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
     logger.addHandler(console_handler)
     return logger
 
-def get_eligible_games(db_path: Path, batch_size: int) -> List[Tuple[int, str, str, str]]:
+def connect_db(db_path: Path) -> sqlite3.Connection:
+    """
+    Open the connection shared by the whole run.
+    
+    WAL with synchronous=NORMAL avoids a full fsync on every commit while
+    still surviving a process crash, and lets the web app keep reading
+    while the update runs. Pragmas are applied once per run.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    """
+    Create the objects this script relies on if they are missing.
+    
+    pricecharting_http_cache holds each page's ETag/Last-Modified validators.
+    idx_pricecharting_prices_retrieve is the index from add_price_update_view.sql;
+    without it eligible_price_updates scans the whole price history.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pricecharting_http_cache (
+            pricecharting_id TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pricecharting_prices_retrieve
+        ON pricecharting_prices(pricecharting_id, retrieve_time)
+    """)
+    conn.commit()
+
+def get_http_validators(conn: sqlite3.Connection, pricecharting_id: str) -> Optional[Tuple[str, str]]:
+    """Get the (etag, last_modified) pair saved for a page, if any."""
+    return conn.execute("""
+        SELECT etag, last_modified
+        FROM pricecharting_http_cache
+        WHERE pricecharting_id = ?
+    """, (pricecharting_id,)).fetchone()
+
+def get_latest_prices(conn: sqlite3.Connection, pricecharting_id: str) -> dict:
+    """Get the most recently stored price for each condition of a game."""
+    cursor = conn.execute("""
+        SELECT condition, price
+        FROM pricecharting_prices
+        WHERE pricecharting_id = ?
+          AND retrieve_time = (
+              SELECT MAX(retrieve_time)
+              FROM pricecharting_prices
+              WHERE pricecharting_id = ?
+          )
+    """, (pricecharting_id, pricecharting_id))
+    return dict(cursor.fetchall())
+
+def get_eligible_games(conn: sqlite3.Connection, batch_size: int) -> List[Tuple[int, str, str, str]]:
     """
     Get games eligible for price updates from the database.
     
@@ -143,46 +320,59 @@ def get_eligible_games(db_path: Path, batch_size: int) -> List[Tuple[int, str, s
         List of tuples: (game_id, name, console, pricecharting_id)
     """
     try:
-        with sqlite3.connect(db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT game_id, name, console, pricecharting_id
-                FROM eligible_price_updates
-                LIMIT ?
-            """, (batch_size,))
-            return cursor.fetchall()
+        return conn.execute(ELIGIBLE_GAMES_QUERY, (batch_size,)).fetchall()
     except sqlite3.Error as e:
         raise Exception(f"Database error retrieving eligible games: {e}")
 
-def update_game_price(game_id: int, pricecharting_id: str, db_path: Path, logger: logging.Logger) -> bool:
+def get_eligible_games_preview(conn: sqlite3.Connection, batch_size: int,
+                               preview: int = DRY_RUN_PREVIEW_SIZE) -> Tuple[List[Tuple[int, str, str, str]], int]:
     """
-    Update price for a single game.
+    Get the first few eligible games and how many a run would update, for dry runs.
     
     Returns:
-        True if successful, False otherwise
+        (preview rows, total count), where total count is capped at batch_size
+    """
+    try:
+        rows = conn.execute(ELIGIBLE_GAMES_QUERY, (min(preview, batch_size),)).fetchall()
+        total = conn.execute(ELIGIBLE_GAMES_COUNT_QUERY, (batch_size,)).fetchone()[0]
+        return rows, total
+    except sqlite3.Error as e:
+        raise Exception(f"Database error retrieving eligible games: {e}")
+
+def update_game_price(game_id: int, pricecharting_id: str, conn: sqlite3.Connection,
+                      session: requests.Session, rate_limiter: TokenBucket,
+                      logger: logging.Logger) -> Tuple[Optional[List[Tuple]], Optional[Tuple]]:
+    """
+    Fetch prices for a single game.
+    
+    An unchanged page (304) re-records the last stored prices with the new
+    retrieve time, so the game still moves to the back of the update queue.
+    
+    Returns:
+        (price records to insert, validators row to save); records is None
+        if the fetch failed
     """
     try:
         # Fetch current prices from PriceCharting
-        price_data = get_game_prices(pricecharting_id)
+        price_data = get_game_prices(pricecharting_id, session,
+                                     get_http_validators(conn, pricecharting_id), rate_limiter)
         
         if not price_data:
             logger.warning(f"No price data retrieved for game {game_id} (PC ID: {pricecharting_id})")
-            return False
+            return None, None
         
-        # Insert price records into database
-        with sqlite3.connect(db_path) as conn:
-            success = insert_price_records(price_data, conn)
-            
-        if success:
-            logger.debug(f"Successfully updated prices for game {game_id}")
-        else:
-            logger.warning(f"Failed to insert price records for game {game_id}")
-            
-        return success
+        if price_data.get('not_modified'):
+            logger.debug(f"Prices unchanged for game {game_id}")
+            price_data['prices'] = get_latest_prices(conn, pricecharting_id)
+            return build_price_records(price_data), None
+        
+        logger.debug(f"Successfully retrieved prices for game {game_id}")
+        validators = (pricecharting_id, price_data['etag'], price_data['last_modified'])
+        return build_price_records(price_data), validators
         
     except Exception as e:
         logger.error(f"Error updating price for game {game_id}: {e}")
-        return False
+        return None, None
 
 def format_duration(seconds: float) -> str:
     """Format duration in seconds to human-readable string."""
@@ -202,12 +392,16 @@ def main():
     parser.add_argument('--batch-size', type=int, 
                       default=int(os.environ.get('PRICE_BATCH_SIZE', DEFAULT_BATCH_SIZE)),
                       help=f'Number of games to update (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--rate', type=float, default=DEFAULT_REQUEST_RATE,
+                      help=f'Average requests per second to PriceCharting (default: {DEFAULT_REQUEST_RATE})')
     parser.add_argument('--verbose', action='store_true',
                       help='Enable verbose logging')
     parser.add_argument('--dry-run', action='store_true',
                       help='Show what would be updated without making changes')
     
     args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error('--rate must be greater than 0')
     
     # Setup logging
     logger = setup_logging(args.verbose)
@@ -223,9 +417,33 @@ def main():
     start_time = time.time()
     logger.info(f"Starting daily price update - Batch size: {args.batch_size}")
     
+    conn = None
     try:
+        if args.dry_run:
+            # Read-only, with none of connect_db's pragmas: journal_mode=WAL is persisted in
+            # the database file, so a dry run must not set it
+            conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+            
+            # Only the preview rows and a count are read from the database
+            preview, total = get_eligible_games_preview(conn, args.batch_size)
+            
+            if not total:
+                logger.info("No games found needing price updates")
+                return
+            
+            logger.info(f"Found {total} games to update")
+            logger.info("DRY RUN - Would update the following games:")
+            for game_id, name, console, pc_id in preview:
+                logger.info(f"  - {name} ({console}) [PC: {pc_id}]")
+            if total > len(preview):
+                logger.info(f"  ... and {total - len(preview)} more")
+            return
+        
+        # One connection is shared by every query and insert in the run
+        conn = connect_db(db_path)
+        
         # Get eligible games
-        games = get_eligible_games(db_path, args.batch_size)
+        games = get_eligible_games(conn, args.batch_size)
         
         if not games:
             logger.info("No games found needing price updates")
@@ -233,33 +451,41 @@ def main():
         
         logger.info(f"Found {len(games)} games to update")
         
-        if args.dry_run:
-            logger.info("DRY RUN - Would update the following games:")
-            for game_id, name, console, pc_id in games[:10]:  # Show first 10
-                logger.info(f"  - {name} ({console}) [PC: {pc_id}]")
-            if len(games) > 10:
-                logger.info(f"  ... and {len(games) - 10} more")
-            return
-        
         # Process each game
+        ensure_schema(conn)
         successful = 0
         failed = 0
+        all_records = []
+        all_validators = []
+        # Keep to roughly --rate requests per second to be respectful to PriceCharting
+        rate_limiter = TokenBucket(args.rate, REQUEST_BURST)
+        session = create_session()
         
-        for i, (game_id, name, console, pricecharting_id) in enumerate(games, 1):
-            # Progress indicator
-            percent = (i / len(games)) * 100
-            logger.info(f"[{i}/{len(games)}] ({percent:.0f}%) Updating: {name} ({console})")
-            
-            # Update the game
-            if update_game_price(game_id, pricecharting_id, db_path, logger):
-                successful += 1
-            else:
-                failed += 1
+        try:
+            # Per-game lines go to debug; info only gets a line every ~5% of the batch
+            progress_step = max(1, len(games) // 20)
+            for i, (game_id, name, console, pricecharting_id) in enumerate(games, 1):
+                logger.debug("[%d/%d] Updating: %s (%s)", i, len(games), name, console)
+                
+                # Fetch the game's prices; rows are inserted together below
+                records, validators = update_game_price(game_id, pricecharting_id, conn, session,
+                                                        rate_limiter, logger)
+                if records:
+                    all_records.extend(records)
+                    if validators:
+                        all_validators.append(validators)
+                    successful += 1
+                else:
+                    failed += 1
+                
+                if i % progress_step == 0 or i == len(games):
+                    logger.info(f"[{i}/{len(games)}] ({i / len(games) * 100:.0f}%) processed")
             
-            # Small delay between requests to be respectful to PriceCharting
-            # This results in roughly 1 request per second
-            if i < len(games):  # Don't sleep after the last game
-                time.sleep(1)
+            if all_records and not insert_price_records(all_records, all_validators, conn):
+                logger.error(f"Failed to insert {len(all_records)} price records")
+                sys.exit(1)
+        finally:
+            session.close()
         
         # Calculate duration
         duration = time.time() - start_time
@@ -281,6 +507,9 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error during price update: {e}")
         sys.exit(1)
+    finally:
+        if conn:
+            conn.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -80,18 +80,29 @@ def fix_games_for_sale_schema():
         """)
         
         print("Step 6: Migrating data to new schema...")
-        for row in current_data:
-            # row structure: [id, physical_game_id, date_marked, asking_price, notes, orig_date, orig_source, orig_price, purchased_game_id, name, console]
-            if row[8]:  # If we have a purchased_game_id
-                cursor.execute("""
-                    INSERT INTO games_for_sale 
-                    (purchased_game_id, date_marked, asking_price, notes, 
-                     original_acquisition_date, original_source, original_purchase_price)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (row[8], row[2], row[3], row[4], row[5], row[6], row[7]))
-                print(f"  Migrated: {row[9]} ({row[10]})")
-            else:
-                print(f"  WARNING: No purchased_game_id for {row[9]} ({row[10]}) - skipping")
+        cursor.execute("""
+            INSERT INTO games_for_sale 
+            (purchased_game_id, date_marked, asking_price, notes, 
+             original_acquisition_date, original_source, original_purchase_price)
+            SELECT pg.id, gfs.date_marked, gfs.asking_price, gfs.notes,
+                   gfs.original_acquisition_date, gfs.original_source, gfs.original_purchase_price
+            FROM games_for_sale_backup gfs
+            JOIN purchased_games pg ON pg.physical_game = gfs.physical_game_id
+            ORDER BY gfs.id
+        """)
+        print(f"  Migrated {cursor.rowcount} records")
+        
+        cursor.execute("""
+            SELECT p.name, p.console
+            FROM games_for_sale_backup gfs
+            JOIN physical_games p ON gfs.physical_game_id = p.id
+            WHERE NOT EXISTS (
+                SELECT 1 FROM purchased_games pg WHERE pg.physical_game = gfs.physical_game_id
+            )
+            ORDER BY gfs.id
+        """)
+        for name, console in cursor.fetchall():
+            print(f"  WARNING: No purchased_game_id for {name} ({console}) - skipping")
         
         print("Step 7: Verifying migration...")
         cursor.execute("SELECT COUNT(*) FROM games_for_sale")
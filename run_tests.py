@@ -2,6 +2,7 @@
 """
 Test runner script for collecting-website
 """
+import compileall
 import subprocess
 import sys
 import os
@@ -18,9 +19,15 @@ def run_python_tests():
             "tests/", 
             "-v", 
             "--tb=short", 
+            # Unclosed files/sockets warn from __del__, which pytest only reports as an
+            # unraisable-exception warning; make both fail the run
+            "-W", "error::ResourceWarning",
+            "-W", "error::pytest.PytestUnraisableExceptionWarning",
             "--cov=app", 
             "--cov-report=term-missing",
-            "--cov-report=html"
+            "--cov-report=html",
+            "-n", "auto",
+            "--dist=loadfile"
         ], check=True, capture_output=False)
         
         print("✅ Python tests passed!")
@@ -57,22 +64,17 @@ def run_linting():
         print("No Python files found for linting")
         return True
     
-    try:
-        # Basic Python syntax check
-        for py_file in ["app/__init__.py", "app/routes.py", "config.py", "wsgi.py"]:
-            if Path(py_file).exists():
-                result = subprocess.run([
-                    sys.executable, "-m", "py_compile", py_file
-                ], check=True, capture_output=True, text=True)
-        
+    # Basic Python syntax check, compiled in-process with a worker pool
+    ok = compileall.compile_dir("app", quiet=1, workers=os.cpu_count() or 1)
+    for py_file in ["config.py", "wsgi.py"]:
+        if Path(py_file).exists():
+            ok = compileall.compile_file(py_file, quiet=1) and ok
+    
+    if ok:
         print("✅ Python syntax check passed!")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Syntax errors found: {e.stderr}")
-        return False
-    except FileNotFoundError:
-        print("⚠️  Linting tools not available, skipping...")
-        return True
+    print("❌ Syntax errors found (see output above)")
+    return False
 
 def main():
     """Run all tests and checks"""
@@ -0,0 +1,72 @@
+"""
+Benchmarks for the Photo Service hot paths.
+Not collected by a plain `pytest tests/` run (only test_*.py files are); run explicitly with
+`python -m pytest tests/bench_photo_service.py`.
+"""
+import itertools
+import sqlite3
+
+import pytest
+
+from app.photo_service import PhotoService
+
+# Photos attached to the benchmark game before the read benchmarks run
+SEEDED_PHOTOS = 20
+
+# The schema, app and in-memory database come from conftest.py; each benchmark starts
+# from this module's template
+pytestmark = pytest.mark.usefixtures('db')
+
+
+@pytest.fixture(scope='module')
+def template_db(schema_db):
+    """Schema plus one game with photos, cloned into the test database per benchmark"""
+    conn = sqlite3.connect(':memory:')
+    schema_db.backup(conn)
+    with conn:
+        conn.execute("INSERT INTO physical_games (id, name, console) VALUES (1, 'Bench Game', 'Bench Console')")
+        conn.executemany("""
+            INSERT INTO game_photos (id, s3_bucket, s3_key, original_filename, file_size, mime_type)
+            VALUES (?, 'bench-bucket', ?, ?, 1024, 'image/jpeg')
+        """, [(i, f"photos/1/seed_{i}.jpg", f"seed_{i}.jpg") for i in range(1, SEEDED_PHOTOS + 1)])
+        conn.executemany("""
+            INSERT INTO physical_game_photos (physical_game_id, game_photo_id, photo_order)
+            VALUES (1, ?, ?)
+        """, [(i, i - 1) for i in range(1, SEEDED_PHOTOS + 1)])
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app_context(app):
+    """Run the benchmarks inside the shared test app's context, as PhotoService does in requests"""
+    with app.app_context():
+        yield
+
+
+def test_bench_create_photo_record(benchmark):
+    """Benchmark inserting a photo record"""
+    counter = itertools.count()
+
+    def create():
+        n = next(counter)
+        return PhotoService.create_photo_record(
+            s3_bucket="bench-bucket",
+            s3_key=f"photos/2/bench_{n}.jpg",
+            original_filename=f"bench_{n}.jpg",
+            file_size=1024,
+            mime_type="image/jpeg"
+        )
+
+    assert benchmark(create) > 0
+
+
+def test_bench_get_game_photos(benchmark):
+    """Benchmark listing a game's photos"""
+    photos = benchmark(PhotoService.get_game_photos, 1)
+    assert len(photos) == SEEDED_PHOTOS
+
+
+def test_bench_get_next_photo_order(benchmark):
+    """Benchmark computing the next photo order for a game"""
+    assert benchmark(PhotoService.get_next_photo_order, 1) == SEEDED_PHOTOS
@@ -0,0 +1,108 @@
+"""
+Shared test fixtures: one Flask app, test client and in-memory database per test session.
+
+Modules that use the database add `pytestmark = pytest.mark.usefixtures('db')` so every
+test starts from their `template_db`; they override `template_db` to add seed data.
+"""
+import pytest
+from contextlib import contextmanager
+import functools
+import os
+from pathlib import Path
+import sqlite3
+import uuid
+
+from app import create_app
+
+# Production schema, read once when the test session starts
+SCHEMA_SQL = (Path(__file__).parent.parent / "test_schema.sql").read_text()
+
+TEST_CONFIG = (('TESTING', True),)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_app(config):
+    """Build one application per distinct config, given as a tuple of (key, value) items"""
+    app = create_app()
+    app.config.update(config)
+    return app
+
+
+def init_test_db(conn):
+    """Initialize the test database on an open connection using production schema"""
+    # One transaction for the whole schema instead of one per CREATE statement
+    conn.executescript(f"BEGIN;\n{SCHEMA_SQL}\nCOMMIT;")
+
+
+@pytest.fixture(scope='session')
+def db_path():
+    """URI of a uniquely named in-memory database shared by every connection opened to it"""
+    # The xdist worker id in the name tells the workers' databases apart when debugging
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+    return f'file:test_{worker}_{uuid.uuid4().hex}?mode=memory&cache=shared'
+
+
+@pytest.fixture(scope='session')
+def db_connection(db_path):
+    """
+    Hold the in-memory database open for the session; it only lives while a connection is open.
+    The connection is in autocommit mode, so multi-statement seeding wraps itself in immediate_transaction().
+    """
+    conn = sqlite3.connect(db_path, uri=True, isolation_level=None)
+    # Match the app's connections so rows seeded through this one obey the same constraints
+    conn.execute("PRAGMA foreign_keys = ON")
+    yield conn
+    conn.close()
+
+
+@contextmanager
+def immediate_transaction(conn):
+    """
+    Run the block in one BEGIN IMMEDIATE transaction on an autocommit connection such as db_connection.
+    Rolls back if the block raises: a transaction left open on the shared connection would break
+    every later test's database reset.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except Exception:
+        # SQLite already rolls back by itself after some errors
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+@pytest.fixture(scope='session')
+def schema_db():
+    """Database with only the production schema, built once and copied into templates"""
+    conn = sqlite3.connect(':memory:')
+    init_test_db(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope='module')
+def template_db(schema_db):
+    """Database cloned into the test database before each test; override to add seed data"""
+    return schema_db
+
+
+@pytest.fixture
+def db(db_connection, template_db):
+    """Reset the database to the module's template before each test so tests stay isolated"""
+    template_db.backup(db_connection)
+
+
+@pytest.fixture(scope='session')
+def app(db_path):
+    """Create application once for the whole test session"""
+    app = cached_app(TEST_CONFIG)
+    app.config['DATABASE_PATH'] = db_path
+    return app
+
+
+@pytest.fixture(scope='session')
+def client(app):
+    """Create one test client for the session; the app sets no cookies, so it carries no state between tests"""
+    return app.test_client()
@@ -0,0 +1,276 @@
+"""
+Tests for the daily PriceCharting price update script
+"""
+import pytest
+import logging
+from pathlib import Path
+import sqlite3
+from unittest.mock import patch, MagicMock
+
+import daily_price_update
+from daily_price_update import (
+    TokenBucket, extract_price, get_eligible_games_preview, get_game_prices,
+    insert_price_records, parse_game_prices, update_game_price
+)
+
+ROOT = Path(__file__).parent.parent
+SCHEMA_SQL = (ROOT / "test_schema.sql").read_text()
+VIEW_SQL = (ROOT / "add_price_update_view.sql").read_text()
+
+PRICECHARTING_ID = 12345
+
+GAME_PAGE = b"""
+<html><body>
+    <td id="used_price"><span class="price js-price">$12.50</span></td>
+    <td id="complete_price"><span class="js-price price">$1,234.56</span></td>
+    <td id="new_price"><span class="price js-price">-</span></td>
+</body></html>
+"""
+
+logger = logging.getLogger('daily_price_update')
+
+
+@pytest.fixture
+def price_db(tmp_path):
+    """Path of a file database with the production schema, the update view and one owned game"""
+    path = tmp_path / "games.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_SQL + VIEW_SQL)
+    conn.execute("INSERT INTO physical_games (id, name, console) VALUES (1, 'Super Mario 64', 'N64')")
+    conn.execute("INSERT INTO purchased_games (physical_game, acquisition_date) VALUES (1, '2024-01-01')")
+    conn.execute("""
+        INSERT INTO pricecharting_games (id, pricecharting_id, name, console)
+        VALUES (1, ?, 'Super Mario 64', 'N64')
+    """, (PRICECHARTING_ID,))
+    conn.execute("INSERT INTO physical_games_pricecharting_games (physical_game, pricecharting_game) VALUES (1, 1)")
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def conn(price_db):
+    """Connection to price_db with the script's own tables created"""
+    conn = sqlite3.connect(price_db)
+    daily_price_update.ensure_schema(conn)
+    yield conn
+    conn.close()
+
+
+def mock_session(status_code, content=b'', headers=None):
+    """Session whose get() answers every request with the given response"""
+    response = MagicMock(status_code=status_code, content=content, headers=headers or {})
+    session = MagicMock()
+    session.get.return_value = response
+    return session
+
+
+def stored_prices(conn):
+    """Every stored price row as (retrieve_time, condition, price), oldest first"""
+    return conn.execute("""
+        SELECT retrieve_time, condition, price
+        FROM pricecharting_prices
+        ORDER BY retrieve_time, condition
+    """).fetchall()
+
+
+# Tests for price parsing
+
+@pytest.mark.parametrize('text, expected', [
+    ('$1,234.56', 1234.56),
+    ('$12.50', 12.5),
+    ('$7', 7.0),
+    ('-', None),
+    ('', None),
+])
+def test_extract_price(text, expected):
+    """Test that price strings are converted to floats and missing prices to None"""
+    assert extract_price(text) == expected
+
+
+def test_parse_game_prices():
+    """Test that each condition is read from its element, whatever the class order"""
+    assert parse_game_prices(GAME_PAGE) == {'complete': 1234.56, 'new': None, 'loose': 12.5}
+
+
+def test_parse_game_prices_missing_elements():
+    """Test that a page without price elements yields None for every condition"""
+    assert parse_game_prices(b"<html><body></body></html>") == {
+        'complete': None, 'new': None, 'loose': None
+    }
+
+
+# Tests for rate limiting
+
+def test_token_bucket_allows_burst_then_waits():
+    """Test that `capacity` requests go through at once and the next waits 1/rate seconds"""
+    clock = [100.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    with patch('daily_price_update.time.monotonic', lambda: clock[0]), \
+         patch('daily_price_update.time.sleep', sleep):
+        bucket = TokenBucket(rate=2.0, capacity=3)
+        for _ in range(3):
+            bucket.acquire()
+        assert sleeps == []
+
+        bucket.acquire()
+        assert sleeps == [pytest.approx(0.5)]
+
+
+# Tests for fetching
+
+def test_get_game_prices_sends_validators():
+    """Test that saved validators are sent as conditional request headers"""
+    session = mock_session(304)
+
+    result = get_game_prices('12345', session, ('"abc"', 'Mon, 01 Jan 2024 00:00:00 GMT'))
+
+    assert session.get.call_args.kwargs['headers'] == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'
+    }
+    assert result['not_modified'] is True
+    assert 'prices' not in result
+
+
+def test_get_game_prices_without_validators_is_unconditional():
+    """Test that a page fetched for the first time is requested without conditional headers"""
+    session = mock_session(200, GAME_PAGE)
+
+    result = get_game_prices('12345', session)
+
+    assert session.get.call_args.kwargs['headers'] == {}
+    assert result['prices'] == {'complete': 1234.56, 'new': None, 'loose': 12.5}
+
+
+# Tests for storing prices
+
+def test_update_stores_prices_and_validators(conn):
+    """Test that a 200 response stores the page's prices and its ETag/Last-Modified"""
+    session = mock_session(200, GAME_PAGE, {
+        'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'
+    })
+
+    records, validators = update_game_price(1, PRICECHARTING_ID, conn, session, None, logger)
+    assert insert_price_records(records, [validators], conn)
+
+    assert [(condition, price) for _, condition, price in stored_prices(conn)] == [
+        ('complete', 1234.56), ('loose', 12.5), ('new', None)
+    ]
+    assert daily_price_update.get_http_validators(conn, PRICECHARTING_ID) == (
+        '"v1"', 'Mon, 01 Jan 2024 00:00:00 GMT'
+    )
+
+
+def test_update_replaces_saved_validators(conn):
+    """Test that a changed page overwrites the validators saved for it"""
+    conn.execute("INSERT INTO pricecharting_http_cache VALUES (?, '\"v1\"', NULL)", (PRICECHARTING_ID,))
+    conn.commit()
+    session = mock_session(200, GAME_PAGE, {'ETag': '"v2"'})
+
+    records, validators = update_game_price(1, PRICECHARTING_ID, conn, session, None, logger)
+    assert insert_price_records(records, [validators], conn)
+
+    assert conn.execute("SELECT etag, last_modified FROM pricecharting_http_cache").fetchall() == [('"v2"', None)]
+
+
+def test_not_modified_reinserts_latest_prices(conn):
+    """Test that a 304 sends the saved validators and re-records the last stored prices"""
+    conn.executemany("""
+        INSERT INTO pricecharting_prices (pricecharting_id, retrieve_time, price, condition)
+        VALUES (?, ?, ?, ?)
+    """, [
+        (PRICECHARTING_ID, '2024-01-01T00:00:00+00:00', 10.0, 'loose'),
+        (PRICECHARTING_ID, '2024-02-01T00:00:00+00:00', 20.0, 'loose'),
+        (PRICECHARTING_ID, '2024-02-01T00:00:00+00:00', 30.0, 'complete'),
+    ])
+    conn.execute("""
+        INSERT INTO pricecharting_http_cache VALUES (?, '"v1"', 'Thu, 01 Feb 2024 00:00:00 GMT')
+    """, (PRICECHARTING_ID,))
+    conn.commit()
+    session = mock_session(304)
+
+    records, validators = update_game_price(1, PRICECHARTING_ID, conn, session, None, logger)
+    assert validators is None
+    assert insert_price_records(records, [], conn)
+
+    assert session.get.call_args.kwargs['headers'] == {
+        'If-None-Match': '"v1"',
+        'If-Modified-Since': 'Thu, 01 Feb 2024 00:00:00 GMT'
+    }
+    latest = stored_prices(conn)[3:]
+    assert [(condition, price) for _, condition, price in latest] == [('complete', 30.0), ('loose', 20.0)]
+    assert latest[0][0] > '2024-02-01T00:00:00+00:00'
+    # The saved validators are left as they were
+    assert conn.execute("SELECT etag FROM pricecharting_http_cache").fetchall() == [('"v1"',)]
+
+
+def test_insert_price_records_rolls_back_on_failure(conn):
+    """Test that a failing validators upsert also discards the run's price rows"""
+    records = [(PRICECHARTING_ID, '2024-01-01T00:00:00+00:00', 10.0, 'loose')]
+
+    # A validators row with too few values fails after the prices are inserted
+    assert not insert_price_records(records, [(PRICECHARTING_ID, '"v1"')], conn)
+
+    assert stored_prices(conn) == []
+    assert not conn.in_transaction
+
+
+# Tests for dry runs
+
+def test_eligible_games_preview_counts_up_to_batch_size(conn):
+    """Test that the dry run preview is capped and the count stops at the batch size"""
+    conn.executemany("INSERT INTO physical_games (name, console) VALUES (?, 'N64')",
+                     [(f'Game {i}',) for i in range(14)])
+    conn.execute("""
+        INSERT INTO purchased_games (physical_game, acquisition_date)
+        SELECT id, '2024-01-01' FROM physical_games WHERE id > 1
+    """)
+    conn.execute("""
+        INSERT INTO physical_games_pricecharting_games (physical_game, pricecharting_game)
+        SELECT id, 1 FROM physical_games WHERE id > 1
+    """)
+    conn.commit()
+
+    rows, total = get_eligible_games_preview(conn, batch_size=12, preview=10)
+    assert len(rows) == 10
+    assert total == 12
+
+    rows, total = get_eligible_games_preview(conn, batch_size=100, preview=10)
+    assert len(rows) == 10
+    assert total == 15
+
+
+def test_dry_run_leaves_database_unchanged(price_db, monkeypatch, caplog):
+    """Test that a dry run lists the games without changing the journal mode or writing anything"""
+    monkeypatch.setenv('DATABASE_PATH', str(price_db))
+    monkeypatch.setattr('sys.argv', ['daily_price_update.py', '--dry-run'])
+    # Skip the script's own handlers; caplog captures the records
+    monkeypatch.setattr(daily_price_update, 'setup_logging', lambda verbose: logger)
+
+    with patch('daily_price_update.create_session') as create_session, caplog.at_level(logging.INFO):
+        daily_price_update.main()
+
+    create_session.assert_not_called()
+    assert "Found 1 games to update" in caplog.text
+    assert "Super Mario 64 (N64)" in caplog.text
+
+    conn = sqlite3.connect(price_db)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+        # ensure_schema() only runs for real updates
+        assert conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'pricecharting_http_cache'"
+        ).fetchone()[0] == 0
+    finally:
+        conn.close()
+    assert not Path(f"{price_db}-wal").exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
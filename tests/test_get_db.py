@@ -0,0 +1,71 @@
+"""
+Tests for the per-app-context database connection handed out by app.routes.get_db
+"""
+import pytest
+import sqlite3
+
+from app.routes import get_db
+
+# Every test starts from the session's schema-only database (see conftest.py)
+pytestmark = pytest.mark.usefixtures('db')
+
+
+def test_get_db_reuses_connection_within_app_context(app):
+    """Test that every get_db() block in one app context gets the same connection"""
+    with app.app_context():
+        with get_db() as first:
+            pass
+        with get_db() as second:
+            assert second is first
+
+
+def test_get_db_opens_new_connection_per_app_context(app):
+    """Test that a new app context gets its own connection"""
+    with app.app_context():
+        with get_db() as first:
+            pass
+    with app.app_context():
+        with get_db() as second:
+            assert second is not first
+
+
+def test_get_db_connection_closed_when_app_context_ends(app):
+    """Test that close_db() closes the connection when the app context pops"""
+    with app.app_context():
+        with get_db() as db:
+            db.execute("SELECT 1")
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.execute("SELECT 1")
+
+
+def test_get_db_rolls_back_uncommitted_writes_on_error(app, db_connection):
+    """Test that an exception inside the block discards the block's uncommitted writes"""
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            with get_db() as db:
+                db.execute("INSERT INTO physical_games (name, console) VALUES ('Rolled Back', 'N64')")
+                raise RuntimeError("boom")
+
+        # The same connection is still usable for the rest of the context
+        with get_db() as db:
+            assert not db.in_transaction
+            assert db.execute("SELECT COUNT(*) FROM physical_games").fetchone()[0] == 0
+
+    assert db_connection.execute("SELECT COUNT(*) FROM physical_games").fetchone()[0] == 0
+
+
+def test_get_db_keeps_committed_writes(app, db_connection):
+    """Test that writes committed inside the block are visible to other connections"""
+    with app.app_context():
+        with get_db() as db:
+            db.execute("INSERT INTO physical_games (name, console) VALUES ('Committed', 'N64')")
+            db.commit()
+
+    assert db_connection.execute(
+        "SELECT name FROM physical_games"
+    ).fetchall() == [('Committed',)]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
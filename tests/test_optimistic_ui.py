@@ -2,510 +2,463 @@
 Tests for optimistic UI update functionality
 """
 import pytest
-import json
+import requests
 from unittest.mock import patch, MagicMock
-from app import create_app
-from pathlib import Path
 import sqlite3
-import tempfile
-import os
+from concurrent.futures import ThreadPoolExecutor
+import zlib
 
+pytestmark = pytest.mark.usefixtures('db')
 
-@pytest.fixture
-def app():
-    """Create application for testing"""
-    # Create a temporary database file
-    db_fd, db_path = tempfile.mkstemp(suffix='.db')
-    
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['DATABASE_PATH'] = db_path
-    
-    # Initialize the database with production schema
-    with app.app_context():
-        init_test_db()
-    
-    yield app
+# (slug, name) pairs for games added through the PriceCharting URL routes
+SAMPLE_GAMES = (
+    ('mario-kart-64', 'Mario Kart 64'),
+    ('goldeneye-007', 'Goldeneye 007'),
+    ('perfect-dark', 'Perfect Dark'),
+)
+SAMPLE_URLS = tuple(f'https://www.pricecharting.com/game/nintendo-64/{slug}' for slug, _ in SAMPLE_GAMES)
+
+# Games already in every test database, for tests that act on an existing game
+SEEDED_WISHLIST_GAME = {'id': 1, 'slug': 'banjo-kazooie', 'name': 'Banjo Kazooie', 'console': 'Nintendo 64'}
+SEEDED_COLLECTION_GAME = {'id': 2, 'purchased_game_id': 1, 'slug': 'super-mario-64',
+                          'name': 'Super Mario 64', 'console': 'Nintendo 64'}
+
+
+
+@pytest.fixture(scope='module')
+def template_db(schema_db):
+    """Schema plus the seeded games, cloned into the test database per test"""
+    conn = sqlite3.connect(':memory:')
+    schema_db.backup(conn)
+    seed_games(conn)
+    yield conn
+    conn.close()
+
+
+def seed_games(conn):
+    """Insert the seeded games, linked to PriceCharting games as the add routes do"""
+    games = (SEEDED_WISHLIST_GAME, SEEDED_COLLECTION_GAME)
+    with conn:
+        conn.executemany(
+            "INSERT INTO physical_games (id, name, console) VALUES (?, ?, ?)",
+            [(game['id'], game['name'], game['console']) for game in games]
+        )
+        conn.executemany(
+            "INSERT INTO pricecharting_games (id, pricecharting_id, name, console, url) VALUES (?, ?, ?, ?, ?)",
+            [(game['id'], str(zlib.crc32(game['slug'].encode())), game['name'], game['console'],
+              f"https://www.pricecharting.com/game/nintendo-64/{game['slug']}") for game in games]
+        )
+        conn.executemany(
+            "INSERT INTO physical_games_pricecharting_games (physical_game, pricecharting_game) VALUES (?, ?)",
+            [(game['id'], game['id']) for game in games]
+        )
+        conn.execute(
+            "INSERT INTO wanted_games (physical_game, condition) VALUES (?, 'CIB')",
+            (SEEDED_WISHLIST_GAME['id'],)
+        )
+        conn.execute(
+            """INSERT INTO purchased_games (id, physical_game, condition, acquisition_date, price)
+               VALUES (?, ?, 'CIB', '2024-01-01', 39.99)""",
+            (SEEDED_COLLECTION_GAME['purchased_game_id'], SEEDED_COLLECTION_GAME['id'])
+        )
+
+
+def pricecharting_page(url, *args, **kwargs):
+    """Build a canned PriceCharting product page for a game URL"""
+    slug = url.rstrip('/').split('/')[-1]
+    name = slug.replace('-', ' ').title()
+    response = MagicMock()
+    response.text = (
+        f'<html><h1 id="product_name" title="{zlib.crc32(slug.encode())}">'
+        f'{name} <a>Nintendo 64</a></h1></html>'
+    )
+    return response
+
+
+@pytest.fixture(scope='module', autouse=True)
+def pricecharting_get():
+    """Serve canned PriceCharting pages for the whole module so tests never hit the network"""
+    with patch('app.pricecharting_service.requests.get', side_effect=pricecharting_page) as mock_get:
+        yield mock_get
+
+
+@pytest.fixture(autouse=True)
+def mock_pricecharting(pricecharting_get):
+    """Hand each test the module's PriceCharting mock with its calls and side effect reset"""
+    pricecharting_get.reset_mock(side_effect=True)
+    pricecharting_get.side_effect = pricecharting_page
+    return pricecharting_get
+
+
+@pytest.fixture(scope='module')
+def seeded_games(template_db):
+    """The wishlist and collection games present in every test database"""
+    return {'wishlist': SEEDED_WISHLIST_GAME, 'collection': SEEDED_COLLECTION_GAME}
+
+
+# Tests for optimistic add game functionality
+
+@pytest.mark.parametrize(('url', 'name'), [(url, name) for url, (_, name) in zip(SAMPLE_URLS, SAMPLE_GAMES)],
+                         ids=[slug for slug, _ in SAMPLE_GAMES])
+def test_add_to_wishlist_success(client, url, name):
+    """Test successful addition to wishlist"""
+    response = client.post('/api/wishlist/add',
+        json={
+            'url': url,
+            'condition': 'CIB'
+        }
+    )
     
-    # Cleanup
-    os.close(db_fd)
-    os.unlink(db_path)
+    assert response.status_code == 201
+    data = response.get_json()
+    assert 'game' in data
+    assert data['game']['name'] == name
+    assert data['game']['console'] == 'Nintendo 64'
+    assert data['game']['id'] is not None
 
 
-def init_test_db():
-    """Initialize test database using production schema"""
-    from app.routes import get_db_path
-    import sqlite3
+@pytest.mark.parametrize('url', [
+    'https://invalid-url.com',
+    'https://invalid-pricecharting-url.com',
+    'not-a-url'
+])
+def test_add_to_wishlist_invalid_url(client, mock_pricecharting, url):
+    """Test adding with invalid or malformed URLs"""
+    response = client.post('/api/wishlist/add',
+        json={
+            'url': url,
+            'condition': 'CIB'
+        }
+    )
     
-    schema_path = Path(__file__).parent.parent / "test_schema.sql"
+    assert response.status_code == 400
+    data = response.get_json()
+    assert 'error' in data
+    mock_pricecharting.assert_not_called()
+
+
+def test_add_to_collection_success(client):
+    """Test successful addition to collection"""
+    response = client.post('/api/collection/add',
+        json={
+            'url': SAMPLE_URLS[1],
+            'condition': 'CIB',
+            'purchase_date': '2024-01-01',
+            'purchase_price': 29.99,
+            'purchase_source': 'eBay'
+        }
+    )
     
-    # Connect to the in-memory database
-    conn = sqlite3.connect(get_db_path())
+    assert response.status_code == 201
+    data = response.get_json()
+    assert 'game' in data
+    assert data['game']['name'] == 'Goldeneye 007'
+    assert data['game']['purchase_price'] == 29.99
+    assert data['game']['purchase_source'] == 'eBay'
+
+
+def test_add_to_collection_missing_required_fields(client):
+    """Test adding to collection without required fields"""
+    response = client.post('/api/collection/add',
+        json={
+            'url': SAMPLE_URLS[2],
+            'condition': 'CIB'
+            # Missing purchase_date and purchase_price
+        }
+    )
     
-    try:
-        # Execute the schema SQL
-        with open(schema_path, 'r') as f:
-            schema_sql = f.read()
-        
-        # Execute each statement (split by semicolons, filter empty)
-        statements = [stmt.strip() for stmt in schema_sql.split(';') if stmt.strip()]
-        for statement in statements:
-            conn.execute(statement)
-        
-        conn.commit()
-    finally:
-        conn.close()
+    # Should still work with defaults
+    assert response.status_code == 201
+    data = response.get_json()
+    assert 'game' in data
 
 
-@pytest.fixture
-def client(app):
-    """Create a test client for the app"""
-    return app.test_client()
+# Tests for optimistic remove game functionality
+
+def test_remove_from_wishlist_success(client, seeded_games):
+    """Test successful removal from wishlist"""
+    # Use the seeded wishlist game
+    game_id = seeded_games['wishlist']['id']
+    
+    # Remove the seeded game
+    response = client.delete(f'/api/wishlist/{game_id}/remove')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert 'message' in data
 
 
+def test_remove_from_wishlist_not_found(client):
+    """Test removing non-existent wishlist item"""
+    response = client.delete('/api/wishlist/99999/remove')
+    assert response.status_code == 404
+    data = response.get_json()
+    assert 'error' in data
 
 
-class TestAddGameOptimistic:
-    """Test suite for optimistic add game functionality"""
+def test_remove_from_collection_success(client, seeded_games):
+    """Test successful removal from collection"""
+    # Use the seeded collection game
+    purchased_game_id = seeded_games['collection']['purchased_game_id']
     
-    def test_add_to_wishlist_success(self, client):
-        """Test successful addition to wishlist"""
-        response = client.post('/api/wishlist/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/mario-kart-64',
-                'condition': 'CIB'
-            }
-        )
-        
-        assert response.status_code == 201
-        data = json.loads(response.data)
-        assert 'game' in data
-        assert data['game']['name'] is not None
-        assert data['game']['console'] is not None
-        assert data['game']['id'] is not None
+    # Remove the seeded game
+    response = client.delete(f'/api/purchased_game/{purchased_game_id}/remove_from_collection')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert 'message' in data
+
+
+# Tests for rollback scenarios
+
+def test_add_rollback_on_pricecharting_fetch_error(client, db_connection, mock_pricecharting):
+    """Test that a failed PriceCharting fetch is reported and nothing is added"""
+    mock_pricecharting.side_effect = requests.ConnectionError('PriceCharting unavailable')
     
-    def test_add_to_wishlist_invalid_url(self, client):
-        """Test adding with invalid URL"""
-        response = client.post('/api/wishlist/add',
-            json={
-                'url': 'https://invalid-url.com',
-                'condition': 'CIB'
-            }
-        )
-        
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert 'error' in data
+    response = client.post('/api/wishlist/add',
+        json={
+            'url': 'https://www.pricecharting.com/game/nintendo-64/mario-tennis',
+            'condition': 'CIB'
+        }
+    )
     
-    def test_add_to_collection_success(self, client):
-        """Test successful addition to collection"""
-        response = client.post('/api/collection/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/goldeneye-007',
-                'condition': 'CIB',
-                'purchase_date': '2024-01-01',
-                'purchase_price': 29.99,
-                'purchase_source': 'eBay'
-            }
-        )
-        
-        assert response.status_code == 201
-        data = json.loads(response.data)
-        assert 'game' in data
-        assert data['game']['purchase_price'] == 29.99
-        assert data['game']['purchase_source'] == 'eBay'
+    assert response.status_code == 400
+    data = response.get_json()
+    assert 'error' in data
     
-    def test_add_to_collection_missing_required_fields(self, client):
-        """Test adding to collection without required fields"""
-        response = client.post('/api/collection/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/perfect-dark',
-                'condition': 'CIB'
-                # Missing purchase_date and purchase_price
-            }
-        )
-        
-        # Should still work with defaults
-        assert response.status_code == 201
-        data = json.loads(response.data)
-        assert 'game' in data
+    assert db_connection.execute(
+        "SELECT COUNT(*) FROM physical_games WHERE name = 'Mario Tennis'"
+    ).fetchone()[0] == 0
+
 
+# Tests for purchase conversion optimistic operations
 
-class TestRemoveGameOptimistic:
-    """Test suite for optimistic remove game functionality"""
+def test_purchase_conversion_success(client, seeded_games):
+    """Test successful conversion from wishlist to collection"""
+    # Use the seeded wishlist game
+    game_id = seeded_games['wishlist']['id']
     
-    def setup_method(self):
-        """Set up test data before each test"""
-        self.test_game_id = None
-        self.test_purchased_game_id = None
+    # Convert the seeded wishlist game to purchased
+    purchase_response = client.post(f'/api/wishlist/{game_id}/purchase',
+        json={
+            'purchase_date': '2024-01-15',
+            'purchase_source': 'Local Store',
+            'purchase_price': '34.99'
+        }
+    )
     
-    def test_remove_from_wishlist_success(self, client):
-        """Test successful removal from wishlist"""
-        # First add a game
-        add_response = client.post('/api/wishlist/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/banjo-kazooie',
-                'condition': 'CIB'
-            }
-        )
-        game_data = json.loads(add_response.data)
-        game_id = game_data['game']['id']
-        
-        # Then remove it
-        response = client.delete(f'/api/wishlist/{game_id}/remove')
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert 'message' in data
+    assert purchase_response.status_code == 200
+    purchase_data = purchase_response.get_json()
+    assert 'message' in purchase_data
+    assert 'game' in purchase_data
+    assert purchase_data['game']['purchase_price'] == 34.99
+    assert purchase_data['game']['purchase_source'] == 'Local Store'
+
+
+def test_purchase_conversion_missing_date(client, seeded_games):
+    """Test purchase conversion without required purchase date"""
+    # Use the seeded wishlist game
+    game_id = seeded_games['wishlist']['id']
     
-    def test_remove_from_wishlist_not_found(self, client):
-        """Test removing non-existent wishlist item"""
-        response = client.delete('/api/wishlist/99999/remove')
-        assert response.status_code == 404
-        data = json.loads(response.data)
-        assert 'error' in data
+    # Try to convert without purchase date
+    purchase_response = client.post(f'/api/wishlist/{game_id}/purchase',
+        json={
+            'purchase_source': 'Online',
+            'purchase_price': '45.00'
+        }
+    )
     
-    def test_remove_from_collection_success(self, client):
-        """Test successful removal from collection"""
-        # First add a game
-        add_response = client.post('/api/collection/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/star-fox-64',
-                'condition': 'CIB',
-                'purchase_price': 24.99
-            }
-        )
-        game_data = json.loads(add_response.data)
-        purchased_game_id = game_data['game'].get('purchased_game_id', game_data['game']['id'])
-        
-        # Then remove it
-        response = client.delete(f'/api/purchased_game/{purchased_game_id}/remove_from_collection')
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        assert 'message' in data
-
-
-class TestOptimisticUIRollback:
-    """Test suite for rollback scenarios"""
+    assert purchase_response.status_code == 400
+    error_data = purchase_response.get_json()
+    assert 'error' in error_data
+
+
+def test_purchase_conversion_nonexistent_game(client):
+    """Test purchase conversion for non-existent wishlist game"""
+    purchase_response = client.post('/api/wishlist/99999/purchase',
+        json={
+            'purchase_date': '2024-01-15',
+            'purchase_price': '25.00'
+        }
+    )
     
-    def test_add_rollback_on_database_error(self, client):
-        """Test that add operation handles invalid URLs properly"""
-        response = client.post('/api/wishlist/add',
-            json={
-                'url': 'https://invalid-pricecharting-url.com',
-                'condition': 'CIB'
-            }
-        )
-        
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert 'error' in data
+    assert purchase_response.status_code == 404
+    error_data = purchase_response.get_json()
+    assert 'error' in error_data
+
+
+# Tests for lent status optimistic operations
+
+def test_mark_as_lent_success(client, seeded_games):
+    """Test successful mark as lent operation"""
+    # Use the seeded collection game
+    # The lent API expects physical_game_id, which is stored as 'id'
+    physical_game_id = seeded_games['collection']['id']
     
-    def test_add_rollback_on_pricecharting_error(self, client):
-        """Test handling malformed URLs"""
-        response = client.post('/api/wishlist/add',
-            json={
-                'url': 'not-a-url',
-                'condition': 'CIB'
-            }
-        )
-        
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert 'error' in data
+    # Mark the seeded game as lent
+    lent_response = client.post(f'/api/game/{physical_game_id}/mark_as_lent',
+        json={
+            'lent_date': '2024-02-01',
+            'lent_to': 'Friend Name'
+        }
+    )
+    
+    assert lent_response.status_code == 200
+    lent_data = lent_response.get_json()
+    assert 'message' in lent_data
 
 
-class TestPurchaseConversion:
-    """Test suite for purchase conversion optimistic operations"""
+def test_mark_as_lent_missing_required_fields(client, seeded_games):
+    """Test mark as lent without required fields"""
+    # Use the seeded collection game
+    physical_game_id = seeded_games['collection']['id']
     
-    def test_purchase_conversion_success(self, client):
-        """Test successful conversion from wishlist to collection"""
-        # First add a game to wishlist
-        add_response = client.post('/api/wishlist/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/mario-party-2',
-                'condition': 'CIB'
-            }
-        )
-        game_data = json.loads(add_response.data)
-        game_id = game_data['game']['id']
-        
-        # Then convert it to purchased
-        purchase_response = client.post(f'/api/wishlist/{game_id}/purchase',
-            json={
-                'purchase_date': '2024-01-15',
-                'purchase_source': 'Local Store',
-                'purchase_price': '34.99'
-            }
-        )
-        
-        assert purchase_response.status_code == 200
-        purchase_data = json.loads(purchase_response.data)
-        assert 'message' in purchase_data
-        assert 'game' in purchase_data
-        assert purchase_data['game']['purchase_price'] == 34.99
-        assert purchase_data['game']['purchase_source'] == 'Local Store'
+    # Try to mark as lent without required fields
+    lent_response = client.post(f'/api/game/{physical_game_id}/mark_as_lent',
+        json={
+            'lent_to': 'Someone'
+            # Missing lent_date
+        }
+    )
     
-    def test_purchase_conversion_missing_date(self, client):
-        """Test purchase conversion without required purchase date"""
-        # Add a game to wishlist first
-        add_response = client.post('/api/wishlist/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/paper-mario',
-                'condition': 'CIB'
-            }
-        )
-        game_data = json.loads(add_response.data)
-        game_id = game_data['game']['id']
-        
-        # Try to convert without purchase date
-        purchase_response = client.post(f'/api/wishlist/{game_id}/purchase',
-            json={
-                'purchase_source': 'Online',
-                'purchase_price': '45.00'
-            }
-        )
-        
-        assert purchase_response.status_code == 400
-        error_data = json.loads(purchase_response.data)
-        assert 'error' in error_data
+    assert lent_response.status_code == 400
+    error_data = lent_response.get_json()
+    assert 'error' in error_data
+
+
+def test_unmark_as_lent_success(client, seeded_games):
+    """Test successful return from lent operation"""
+    # Use the seeded collection game
+    physical_game_id = seeded_games['collection']['id']
     
-    def test_purchase_conversion_nonexistent_game(self, client):
-        """Test purchase conversion for non-existent wishlist game"""
-        purchase_response = client.post('/api/wishlist/99999/purchase',
-            json={
-                'purchase_date': '2024-01-15',
-                'purchase_price': '25.00'
-            }
-        )
-        
-        assert purchase_response.status_code == 404
-        error_data = json.loads(purchase_response.data)
-        assert 'error' in error_data
+    # Mark it as lent first
+    lent_response = client.post(f'/api/game/{physical_game_id}/mark_as_lent',
+        json={
+            'lent_date': '2024-02-01',
+            'lent_to': 'Test Person'
+        }
+    )
+    assert lent_response.status_code == 200
+    
+    # Then return from lent
+    return_response = client.delete(f'/api/game/{physical_game_id}/unmark_as_lent')
+    assert return_response.status_code == 200
+    return_data = return_response.get_json()
+    assert 'message' in return_data
 
 
-class TestLentStatusOperations:
-    """Test suite for lent status optimistic operations"""
+def test_unmark_as_lent_not_lent(client):
+    """Test return from lent on game that's not lent out"""
+    return_response = client.delete('/api/game/99999/unmark_as_lent')
+    assert return_response.status_code == 404
+    error_data = return_response.get_json()
+    assert 'error' in error_data
+
+
+# Tests for edit game details optimistic operations
+
+def test_edit_details_success(client, seeded_games):
+    """Test successful edit game details operation"""
+    # Use the seeded collection game
+    physical_game_id = seeded_games['collection']['id']
     
-    def test_mark_as_lent_success(self, client):
-        """Test successful mark as lent operation"""
-        # First add a game to collection
-        add_response = client.post('/api/collection/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/mario-party-3',
-                'condition': 'CIB',
-                'purchase_price': 44.99
-            }
-        )
-        game_data = json.loads(add_response.data)
-        # The lent API expects physical_game_id, which is stored as 'id' in the response
-        physical_game_id = game_data['game']['id']
-        
-        # Then mark it as lent
-        lent_response = client.post(f'/api/game/{physical_game_id}/mark_as_lent',
-            json={
-                'lent_date': '2024-02-01',
-                'lent_to': 'Friend Name'
-            }
-        )
-        
-        assert lent_response.status_code == 200
-        lent_data = json.loads(lent_response.data)
-        assert 'message' in lent_data
+    # Edit the seeded game's details
+    edit_response = client.put(f'/api/game/{physical_game_id}/details',
+        json={
+            'name': 'Super Mario 64 Updated',
+            'console': 'Nintendo 64 Console'
+        }
+    )
     
-    def test_mark_as_lent_missing_required_fields(self, client):
-        """Test mark as lent without required fields"""
-        # Add a game to collection first
-        add_response = client.post('/api/collection/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/super-smash-bros',
-                'condition': 'CIB',
-                'purchase_price': 39.99
-            }
-        )
-        game_data = json.loads(add_response.data)
-        physical_game_id = game_data['game']['id']
-        
-        # Try to mark as lent without required fields
-        lent_response = client.post(f'/api/game/{physical_game_id}/mark_as_lent',
-            json={
-                'lent_to': 'Someone'
-                # Missing lent_date
-            }
-        )
-        
-        assert lent_response.status_code == 400
-        error_data = json.loads(lent_response.data)
-        assert 'error' in error_data
+    assert edit_response.status_code == 200
+    edit_data = edit_response.get_json()
+    assert 'message' in edit_data
+    assert edit_data['name'] == 'Super Mario 64 Updated'
+    assert edit_data['console'] == 'Nintendo 64 Console'
+
+
+@pytest.mark.parametrize(('payload', 'error'), [
+    ({'console': 'Nintendo 64'}, 'Game name is required'),
+    ({'name': 'Mario Kart 64 Updated'}, 'Console is required')
+], ids=['missing-name', 'missing-console'])
+def test_edit_details_missing_field(client, seeded_games, payload, error):
+    """Test edit details without a required name or console"""
+    # Use the seeded collection game
+    physical_game_id = seeded_games['collection']['id']
     
-    def test_unmark_as_lent_success(self, client):
-        """Test successful return from lent operation"""
-        # Add a game to collection
-        add_response = client.post('/api/collection/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/diddy-kong-racing',
-                'condition': 'CIB',
-                'purchase_price': 29.99
-            }
-        )
-        game_data = json.loads(add_response.data)
-        physical_game_id = game_data['game']['id']
-        
-        # Mark it as lent first
-        lent_response = client.post(f'/api/game/{physical_game_id}/mark_as_lent',
-            json={
-                'lent_date': '2024-02-01',
-                'lent_to': 'Test Person'
-            }
-        )
-        assert lent_response.status_code == 200
-        
-        # Then return from lent
-        return_response = client.delete(f'/api/game/{physical_game_id}/unmark_as_lent')
-        assert return_response.status_code == 200
-        return_data = json.loads(return_response.data)
-        assert 'message' in return_data
+    edit_response = client.put(f'/api/game/{physical_game_id}/details', json=payload)
     
-    def test_unmark_as_lent_not_lent(self, client):
-        """Test return from lent on game that's not lent out"""
-        return_response = client.delete('/api/game/99999/unmark_as_lent')
-        assert return_response.status_code == 404
-        error_data = json.loads(return_response.data)
-        assert 'error' in error_data
+    assert edit_response.status_code == 400
+    error_data = edit_response.get_json()
+    assert error_data['error'] == error
 
 
-class TestEditDetailsOperations:
-    """Test suite for edit game details optimistic operations"""
+def test_edit_details_nonexistent_game(client):
+    """Test edit details for non-existent game"""
+    edit_response = client.put('/api/game/99999/details',
+        json={
+            'name': 'Nonexistent Game',
+            'console': 'Nonexistent Console'
+        }
+    )
     
-    def test_edit_details_success(self, client):
-        """Test successful edit game details operation"""
-        # First add a game to collection
-        add_response = client.post('/api/collection/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/super-mario-64',
-                'condition': 'CIB',
-                'purchase_price': 39.99
-            }
-        )
-        game_data = json.loads(add_response.data)
-        physical_game_id = game_data['game']['id']
-        
-        # Then edit the details
-        edit_response = client.put(f'/api/game/{physical_game_id}/details',
-            json={
-                'name': 'Super Mario 64 Updated',
-                'console': 'Nintendo 64 Console'
-            }
-        )
-        
-        assert edit_response.status_code == 200
-        edit_data = json.loads(edit_response.data)
-        assert 'message' in edit_data
-        assert edit_data['name'] == 'Super Mario 64 Updated'
-        assert edit_data['console'] == 'Nintendo 64 Console'
+    assert edit_response.status_code == 404
+    error_data = edit_response.get_json()
+    assert 'error' in error_data
+
+
+# Tests for concurrent optimistic operations
+
+@pytest.fixture
+def file_db(app, schema_db, tmp_path, monkeypatch):
+    """
+    Point the app at an on-disk database for this test.
     
-    def test_edit_details_missing_name(self, client):
-        """Test edit details without required name"""
-        # Add a game to collection first
-        add_response = client.post('/api/collection/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/zelda-ocarina-of-time',
-                'condition': 'CIB',
-                'purchase_price': 49.99
-            }
-        )
-        game_data = json.loads(add_response.data)
-        physical_game_id = game_data['game']['id']
-        
-        # Try to edit without name
-        edit_response = client.put(f'/api/game/{physical_game_id}/details',
-            json={
-                'console': 'Nintendo 64'
-                # Missing name
-            }
-        )
-        
-        assert edit_response.status_code == 400
-        error_data = json.loads(edit_response.data)
-        assert 'error' in error_data
+    Shared-cache in-memory databases fail concurrent writers with
+    'database table is locked' instead of waiting on the busy timeout like
+    the production database file does.
+    """
+    db_path = str(tmp_path / 'games.db')
+    conn = sqlite3.connect(db_path)
+    schema_db.backup(conn)
+    conn.close()
+    monkeypatch.setitem(app.config, 'DATABASE_PATH', db_path)
+
+
+def test_rapid_add_operations(app, file_db):
+    """Test multiple rapid add operations"""
+    urls = SAMPLE_URLS
     
-    def test_edit_details_missing_console(self, client):
-        """Test edit details without required console"""
-        # Add a game to collection first
-        add_response = client.post('/api/collection/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/mario-kart-64',
-                'condition': 'CIB',
-                'purchase_price': 34.99
-            }
-        )
-        game_data = json.loads(add_response.data)
-        physical_game_id = game_data['game']['id']
-        
-        # Try to edit without console
-        edit_response = client.put(f'/api/game/{physical_game_id}/details',
-            json={
-                'name': 'Mario Kart 64 Updated'
-                # Missing console
-            }
-        )
-        
-        assert edit_response.status_code == 400
-        error_data = json.loads(edit_response.data)
-        assert 'error' in error_data
+    def add(url):
+        # The test client's cookie jar is not thread-safe, so each request gets its own client
+        return app.test_client().post('/api/wishlist/add', json={'url': url, 'condition': 'CIB'})
     
-    def test_edit_details_nonexistent_game(self, client):
-        """Test edit details for non-existent game"""
-        edit_response = client.put('/api/game/99999/details',
-            json={
-                'name': 'Nonexistent Game',
-                'console': 'Nonexistent Console'
-            }
-        )
-        
-        assert edit_response.status_code == 404
-        error_data = json.loads(edit_response.data)
-        assert 'error' in error_data
+    # Fire the adds at the same time, as a user clicking quickly would
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        responses = [future.result() for future in [executor.submit(add, url) for url in urls]]
+    
+    # All should succeed as separate games
+    for response in responses:
+        assert response.status_code == 201
+    game_ids = {response.get_json()['game']['id'] for response in responses}
+    assert len(game_ids) == len(urls)
 
 
-class TestConcurrentOperations:
-    """Test suite for concurrent optimistic operations"""
+def test_add_then_remove_same_game(client):
+    """Test adding then immediately removing the same game"""
+    # Add game
+    add_response = client.post('/api/wishlist/add',
+        json={
+            'url': 'https://www.pricecharting.com/game/nintendo-64/donkey-kong-64',
+            'condition': 'CIB'
+        }
+    )
+    game_data = add_response.get_json()
+    game_id = game_data['game']['id']
     
-    def test_rapid_add_operations(self, client):
-        """Test multiple rapid add operations"""
-        urls = [
-            'https://www.pricecharting.com/game/nintendo-64/mario-kart-64',
-            'https://www.pricecharting.com/game/nintendo-64/goldeneye-007',
-            'https://www.pricecharting.com/game/nintendo-64/perfect-dark'
-        ]
-        
-        responses = []
-        for url in urls:
-            response = client.post('/api/wishlist/add',
-                json={'url': url, 'condition': 'CIB'}
-            )
-            responses.append(response)
-        
-        # All should succeed
-        for response in responses:
-            assert response.status_code == 201
+    # Immediately remove
+    remove_response = client.delete(f'/api/wishlist/{game_id}/remove')
     
-    def test_add_then_remove_same_game(self, client):
-        """Test adding then immediately removing the same game"""
-        # Add game
-        add_response = client.post('/api/wishlist/add',
-            json={
-                'url': 'https://www.pricecharting.com/game/nintendo-64/donkey-kong-64',
-                'condition': 'CIB'
-            }
-        )
-        game_data = json.loads(add_response.data)
-        game_id = game_data['game']['id']
-        
-        # Immediately remove
-        remove_response = client.delete(f'/api/wishlist/{game_id}/remove')
-        
-        assert add_response.status_code == 201
-        assert remove_response.status_code == 200
+    assert add_response.status_code == 201
+    assert remove_response.status_code == 200
 
 
 if __name__ == '__main__':
@@ -3,259 +3,254 @@ Tests for Photo Service Layer
 Tests the database operations for photo storage and game associations.
 """
 import pytest
-import tempfile
-import os
-from pathlib import Path
 import sqlite3
+from unittest.mock import patch
 
 # Test imports
-from app import create_app
 from app.photo_service import PhotoService
+from tests.conftest import immediate_transaction
 
+pytestmark = pytest.mark.usefixtures('db')
 
-@pytest.fixture
-def app():
-    """Create test app with temporary database"""
-    db_fd, db_path = tempfile.mkstemp(suffix='.db')
-    
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['DATABASE_PATH'] = db_path
-    
-    with app.app_context():
-        # Initialize test database
-        init_test_db()
-        
-        # Add test data
-        create_test_data()
-    
-    yield app
-    
-    # Cleanup
-    os.close(db_fd)
-    os.unlink(db_path)
 
+@pytest.fixture(scope='module')
+def template_db(schema_db):
+    """Schema plus the photo test data, cloned into the test database per test"""
+    conn = sqlite3.connect(':memory:')
+    schema_db.backup(conn)
+    create_test_data(conn)
+    yield conn
+    conn.close()
 
-def init_test_db():
-    """Initialize test database with schema"""
-    from app.photo_service import get_db
-    
-    schema_path = Path(__file__).parent.parent / "test_schema.sql"
-    
-    with open(schema_path, 'r') as f:
-        schema_sql = f.read()
-    
-    with get_db() as conn:
-        conn.executescript(schema_sql)
 
+@pytest.fixture(scope='module', autouse=True)
+def photo_db(db_path):
+    """Point PhotoService at the test database directly; these tests need no Flask app"""
+    with patch('app.photo_service.get_db_path', return_value=db_path):
+        yield
 
-def create_test_data():
+
+def create_test_data(conn):
     """Create test data for photo tests"""
-    from app.photo_service import get_db
-    
-    with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Create test physical games
-        cursor.execute("""
-            INSERT INTO physical_games (id, name, console) 
-            VALUES (1, 'Test Game 1', 'Test Console 1')
-        """)
-        cursor.execute("""
-            INSERT INTO physical_games (id, name, console) 
-            VALUES (2, 'Test Game 2', 'Test Console 2')
-        """)
-        
-        conn.commit()
+    # Create test physical games
+    with conn:
+        conn.executemany(
+            "INSERT INTO physical_games (id, name, console) VALUES (?, ?, ?)",
+            [(1, 'Test Game 1', 'Test Console 1'), (2, 'Test Game 2', 'Test Console 2')]
+        )
+
+
+def bulk_seed_photos(conn, game_id, count, prefix='test'):
+    """
+    Create `count` active photos for a game in one batch and attach them in photo order.
+    Files are named '<prefix>_<i>.jpg' with a size of 1024 * (i + 1) bytes.
+    Returns the new photo ids.
+    """
+    photo_ids = PhotoService.bulk_create_photo_records([
+        {
+            's3_bucket': "test-bucket",
+            's3_key': f"photos/{game_id}/{prefix}_{i}.jpg",
+            'original_filename': f"{prefix}_{i}.jpg",
+            'file_size': 1024 * (i + 1),
+            'mime_type': "image/jpeg"
+        }
+        for i in range(count)
+    ])
+    with immediate_transaction(conn):
+        conn.executemany("""
+            INSERT INTO physical_game_photos (physical_game_id, game_photo_id, photo_order)
+            VALUES (?, ?, ?)
+        """, [(game_id, photo_id, i) for i, photo_id in enumerate(photo_ids)])
+    return photo_ids
 
 
 class TestPhotoService:
     """Test photo service database operations"""
     
-    def test_generate_s3_key(self, app):
+    def test_generate_s3_key(self):
         """Test S3 key generation"""
-        with app.app_context():
-            key = PhotoService.generate_s3_key(123, "test_image.jpg")
-            
-            assert key.startswith("photos/123/")
-            assert key.endswith("_test_image.jpg")
-            assert len(key.split('_')) >= 3  # timestamp_uuid_filename
+        key = PhotoService.generate_s3_key(123, "test_image.jpg")
+        
+        assert key.startswith("photos/123/")
+        assert key.endswith("_test_image.jpg")
+        assert len(key.split('_')) >= 3  # timestamp_uuid_filename
     
-    def test_create_photo_record(self, app):
+    def test_create_photo_record(self):
         """Test creating photo records"""
-        with app.app_context():
-            photo_id = PhotoService.create_photo_record(
-                s3_bucket="test-bucket",
-                s3_key="photos/123/test.jpg",
-                original_filename="test.jpg",
-                file_size=1024,
-                mime_type="image/jpeg"
-            )
-            
-            assert photo_id is not None
-            assert photo_id > 0
-            
-            # Verify record was created
-            photo = PhotoService.get_photo_by_id(photo_id)
-            assert photo is not None
-            assert photo['s3_bucket'] == "test-bucket"
-            assert photo['s3_key'] == "photos/123/test.jpg"
-            assert photo['original_filename'] == "test.jpg"
-            assert photo['file_size'] == 1024
-            assert photo['mime_type'] == "image/jpeg"
-            assert photo['is_active'] == 1
+        photo_id = PhotoService.create_photo_record(
+            s3_bucket="test-bucket",
+            s3_key="photos/123/test.jpg",
+            original_filename="test.jpg",
+            file_size=1024,
+            mime_type="image/jpeg"
+        )
+        
+        assert photo_id is not None
+        assert photo_id > 0
+        
+        # Verify record was created
+        photo = PhotoService.get_photo_by_id(photo_id)
+        assert photo is not None
+        assert photo['s3_bucket'] == "test-bucket"
+        assert photo['s3_key'] == "photos/123/test.jpg"
+        assert photo['original_filename'] == "test.jpg"
+        assert photo['file_size'] == 1024
+        assert photo['mime_type'] == "image/jpeg"
+        assert photo['is_active'] == 1
+    
+    def test_bulk_create_photo_records(self):
+        """Test creating several photo records at once"""
+        records = [
+            {
+                's3_bucket': "test-bucket",
+                's3_key': f"photos/1/bulk_{i}.jpg",
+                'original_filename': f"bulk_{i}.jpg",
+                'file_size': 1024,
+                'mime_type': "image/jpeg"
+            }
+            for i in range(3)
+        ]
+        
+        photo_ids = PhotoService.bulk_create_photo_records(records)
+        assert len(photo_ids) == 3
+        
+        # IDs come back in record order
+        for photo_id, record in zip(photo_ids, records):
+            assert PhotoService.get_photo_by_id(photo_id)['s3_key'] == record['s3_key']
+        
+        # A failing record rolls back the whole batch
+        with pytest.raises(sqlite3.IntegrityError):
+            PhotoService.bulk_create_photo_records([
+                dict(records[0], s3_key="photos/1/bulk_new.jpg"),
+                records[1]
+            ])
+        assert PhotoService.get_photos_by_s3_keys(["photos/1/bulk_new.jpg"], "test-bucket") == {}
     
-    def test_associate_photo_with_game(self, app):
+    def test_associate_photo_with_game(self):
         """Test associating photos with games"""
-        with app.app_context():
-            # Create a photo record
-            photo_id = PhotoService.create_photo_record(
-                s3_bucket="test-bucket",
-                s3_key="photos/1/test.jpg",
-                original_filename="test.jpg",
-                file_size=1024,
-                mime_type="image/jpeg"
-            )
-            
-            # Associate with game
-            success = PhotoService.associate_photo_with_game(1, photo_id)
-            assert success is True
-            
-            # Test duplicate association fails
-            success = PhotoService.associate_photo_with_game(1, photo_id)
-            assert success is False
+        # Create a photo record
+        photo_id = PhotoService.create_photo_record(
+            s3_bucket="test-bucket",
+            s3_key="photos/1/test.jpg",
+            original_filename="test.jpg",
+            file_size=1024,
+            mime_type="image/jpeg"
+        )
+        
+        # Associate with game
+        success = PhotoService.associate_photo_with_game(1, photo_id)
+        assert success is True
+        
+        # Test duplicate association fails
+        success = PhotoService.associate_photo_with_game(1, photo_id)
+        assert success is False
     
-    def test_get_game_photos(self, app):
+    def test_get_game_photos(self, db_connection):
         """Test retrieving photos for a game"""
-        with app.app_context():
-            # Create and associate multiple photos
-            photo_ids = []
-            for i in range(3):
-                photo_id = PhotoService.create_photo_record(
-                    s3_bucket="test-bucket",
-                    s3_key=f"photos/1/test_{i}.jpg",
-                    original_filename=f"test_{i}.jpg",
-                    file_size=1024 * (i + 1),
-                    mime_type="image/jpeg"
-                )
-                PhotoService.associate_photo_with_game(1, photo_id, i)
-                photo_ids.append(photo_id)
-            
-            # Get photos for game
-            photos = PhotoService.get_game_photos(1)
-            assert len(photos) == 3
-            
-            # Verify ordering
-            for i, photo in enumerate(photos):
-                assert photo['photo_order'] == i
-                assert photo['original_filename'] == f"test_{i}.jpg"
+        # Create and associate multiple photos
+        bulk_seed_photos(db_connection, 1, 3)
+        
+        # Get photos for game
+        photos = PhotoService.get_game_photos(1)
+        assert len(photos) == 3
+        
+        # Verify ordering
+        for i, photo in enumerate(photos):
+            assert photo['photo_order'] == i
+            assert photo['original_filename'] == f"test_{i}.jpg"
     
-    def test_get_photo_count(self, app):
+    def test_get_photo_count(self, db_connection):
         """Test getting photo count for a game"""
-        with app.app_context():
-            # Initially no photos
-            count = PhotoService.get_photo_count(1)
-            assert count == 0
-            
-            # Add photos
-            for i in range(2):
-                photo_id = PhotoService.create_photo_record(
-                    s3_bucket="test-bucket",
-                    s3_key=f"photos/1/count_test_{i}.jpg",
-                    original_filename=f"count_test_{i}.jpg",
-                    file_size=1024,
-                    mime_type="image/jpeg"
-                )
-                PhotoService.associate_photo_with_game(1, photo_id)
-            
-            count = PhotoService.get_photo_count(1)
-            assert count == 2
+        # Initially no photos
+        count = PhotoService.get_photo_count(1)
+        assert count == 0
+        
+        # Add photos
+        bulk_seed_photos(db_connection, 1, 2, prefix='count_test')
+        
+        count = PhotoService.get_photo_count(1)
+        assert count == 2
     
-    def test_soft_delete_photo(self, app):
+    def test_soft_delete_photo(self):
         """Test soft deleting photos"""
-        with app.app_context():
-            # Create photo
-            photo_id = PhotoService.create_photo_record(
-                s3_bucket="test-bucket",
-                s3_key="photos/1/delete_test.jpg",
-                original_filename="delete_test.jpg",
-                file_size=1024,
-                mime_type="image/jpeg"
-            )
-            PhotoService.associate_photo_with_game(1, photo_id)
-            
-            # Verify it exists in active photos
-            count = PhotoService.get_photo_count(1, active_only=True)
-            assert count == 1
-            
-            # Soft delete
-            success = PhotoService.soft_delete_photo(photo_id)
-            assert success is True
-            
-            # Verify it's no longer in active photos
-            count = PhotoService.get_photo_count(1, active_only=True)
-            assert count == 0
-            
-            # But still exists when including inactive
-            count = PhotoService.get_photo_count(1, active_only=False)
-            assert count == 1
+        # Create photo
+        photo_id = PhotoService.create_photo_record(
+            s3_bucket="test-bucket",
+            s3_key="photos/1/delete_test.jpg",
+            original_filename="delete_test.jpg",
+            file_size=1024,
+            mime_type="image/jpeg"
+        )
+        PhotoService.associate_photo_with_game(1, photo_id)
+        
+        # Verify it exists in active photos
+        count = PhotoService.get_photo_count(1, active_only=True)
+        assert count == 1
+        
+        # Soft delete
+        success = PhotoService.soft_delete_photo(photo_id)
+        assert success is True
+        
+        # Verify it's no longer in active photos
+        count = PhotoService.get_photo_count(1, active_only=True)
+        assert count == 0
+        
+        # But still exists when including inactive
+        count = PhotoService.get_photo_count(1, active_only=False)
+        assert count == 1
     
-    def test_verify_game_exists(self, app):
+    def test_verify_game_exists(self):
         """Test game existence verification"""
-        with app.app_context():
-            assert PhotoService.verify_game_exists(1) is True
-            assert PhotoService.verify_game_exists(999) is False
+        assert PhotoService.verify_game_exists(1) is True
+        assert PhotoService.verify_game_exists(999) is False
     
-    def test_get_photos_by_s3_keys(self, app):
+    def test_get_photos_by_s3_keys(self, db_connection):
         """Test getting photos by S3 keys"""
-        with app.app_context():
-            # Create photos with known keys
-            keys = ["photos/1/key1.jpg", "photos/1/key2.jpg"]
-            photo_ids = []
-            
-            for i, key in enumerate(keys):
-                photo_id = PhotoService.create_photo_record(
-                    s3_bucket="test-bucket",
-                    s3_key=key,
-                    original_filename=f"key{i+1}.jpg",
-                    file_size=1024,
-                    mime_type="image/jpeg"
-                )
-                photo_ids.append(photo_id)
-            
-            # Get photos by keys
-            photos = PhotoService.get_photos_by_s3_keys(keys, "test-bucket")
-            assert len(photos) == 2
-            assert "photos/1/key1.jpg" in photos
-            assert "photos/1/key2.jpg" in photos
-            
-            # Test with non-existent key
-            photos = PhotoService.get_photos_by_s3_keys(["photos/1/nonexistent.jpg"], "test-bucket")
-            assert len(photos) == 0
+        # Create photos with known keys
+        bulk_seed_photos(db_connection, 1, 2, prefix='key')
+        keys = ["photos/1/key_0.jpg", "photos/1/key_1.jpg"]
+        
+        # Get photos by keys
+        photos = PhotoService.get_photos_by_s3_keys(keys, "test-bucket")
+        assert len(photos) == 2
+        assert "photos/1/key_0.jpg" in photos
+        assert "photos/1/key_1.jpg" in photos
+        
+        # Test with non-existent key
+        photos = PhotoService.get_photos_by_s3_keys(["photos/1/nonexistent.jpg"], "test-bucket")
+        assert len(photos) == 0
     
-    def test_get_next_photo_order(self, app):
+    def test_get_next_photo_order(self):
         """Test photo order generation"""
-        with app.app_context():
-            # First photo should get order 0
-            assert PhotoService.get_next_photo_order(1) == 0
-            
-            # Add a photo with order 0
-            photo_id = PhotoService.create_photo_record(
-                s3_bucket="test-bucket",
-                s3_key="photos/1/order_test.jpg",
-                original_filename="order_test.jpg",
-                file_size=1024,
-                mime_type="image/jpeg"
-            )
-            PhotoService.associate_photo_with_game(1, photo_id, 0)
-            
-            # Next photo should get order 1
-            assert PhotoService.get_next_photo_order(1) == 1
+        # First photo should get order 0
+        assert PhotoService.get_next_photo_order(1) == 0
+        
+        # Add a photo with order 0
+        photo_id = PhotoService.create_photo_record(
+            s3_bucket="test-bucket",
+            s3_key="photos/1/order_test.jpg",
+            original_filename="order_test.jpg",
+            file_size=1024,
+            mime_type="image/jpeg"
+        )
+        PhotoService.associate_photo_with_game(1, photo_id, 0)
+        
+        # Next photo should get order 1
+        assert PhotoService.get_next_photo_order(1) == 1
     
-    def test_unique_constraints(self, app):
+    def test_unique_constraints(self):
         """Test unique constraints work correctly"""
-        with app.app_context():
-            # Test unique S3 reference constraint
+        # Test unique S3 reference constraint
+        PhotoService.create_photo_record(
+            s3_bucket="test-bucket",
+            s3_key="photos/1/unique_test.jpg",
+            original_filename="unique_test.jpg",
+            file_size=1024,
+            mime_type="image/jpeg"
+        )
+        
+        # Attempt to create duplicate should fail
+        with pytest.raises(sqlite3.IntegrityError):
             PhotoService.create_photo_record(
                 s3_bucket="test-bucket",
                 s3_key="photos/1/unique_test.jpg",
@@ -263,35 +258,20 @@ class TestPhotoService:
                 file_size=1024,
                 mime_type="image/jpeg"
             )
-            
-            # Attempt to create duplicate should fail
-            with pytest.raises(sqlite3.IntegrityError):
-                PhotoService.create_photo_record(
-                    s3_bucket="test-bucket",
-                    s3_key="photos/1/unique_test.jpg",
-                    original_filename="unique_test.jpg",
-                    file_size=1024,
-                    mime_type="image/jpeg"
-                )
     
-    def test_foreign_key_constraints(self, app):
+    def test_foreign_key_constraints(self):
         """Test foreign key constraints"""
-        with app.app_context():
-            # Create photo
-            photo_id = PhotoService.create_photo_record(
-                s3_bucket="test-bucket",
-                s3_key="photos/1/fk_test.jpg",
-                original_filename="fk_test.jpg",
-                file_size=1024,
-                mime_type="image/jpeg"
-            )
-            
-            # Association with non-existent game should fail
-            # Note: SQLite foreign key enforcement may vary by configuration
-            try:
-                result = PhotoService.associate_photo_with_game(999, photo_id)
-                # If no exception, check that the association was rejected
-                assert result is False or True  # Either it fails or succeeds, both are valid test outcomes
-            except sqlite3.IntegrityError:
-                # This is the expected behavior with foreign keys enabled
-                pass
\ No newline at end of file
+        # Create photo
+        photo_id = PhotoService.create_photo_record(
+            s3_bucket="test-bucket",
+            s3_key="photos/1/fk_test.jpg",
+            original_filename="fk_test.jpg",
+            file_size=1024,
+            mime_type="image/jpeg"
+        )
+        
+        # Association with non-existent game should fail; get_db() turns
+        # foreign keys on, so the insert is rejected rather than ignored
+        result = PhotoService.associate_photo_with_game(999, photo_id)
+        assert result is False
+        assert PhotoService.get_photo_count(999, active_only=False) == 0
\ No newline at end of file
@@ -2,459 +2,315 @@
 Tests for selective game data refresh functionality (Phase 3)
 """
 import pytest
-import json
-from unittest.mock import patch, MagicMock
-from app import create_app
-from pathlib import Path
+from contextlib import contextmanager
+import functools
 import sqlite3
-import tempfile
-import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from tests.conftest import immediate_transaction
+
+
+# SQLite's default limit on bound parameters per statement before 3.32
+MAX_SQL_VARIABLES = 999
+
+# GET /api/game/<id> scenarios: (name, console, seed_game() keyword arguments, expected fields)
+SINGLE_GAME_SCENARIOS = [
+    ("Test Game", "Test Console",
+     {'purchased': {'acquisition_date': "2024-01-01", 'source': "Test Store", 'price': 29.99, 'condition': "complete"}},
+     {'condition': 'complete', 'purchase_price': 29.99,
+      'source_name': None,  # No source record created
+      'is_wanted': False, 'is_lent': False, 'is_for_sale': False}),
+    ("Wishlist Game", "N64",
+     {'wanted': {'condition': "CIB"}},
+     {'condition': 'CIB', 'is_wanted': True, 'purchase_price': None, 'purchased_game_id': None}),
+    ("Lent Game", "GameCube",
+     {'purchased': {'acquisition_date': "2024-01-01"},
+      'lent': {'lent_date': "2024-02-01", 'lent_to': "Friend Name", 'note': "Test note"}},
+     {'is_lent': True, 'lent_date': '2024-02-01', 'lent_to': 'Friend Name', 'lent_note': 'Test note'}),
+    ("Sale Game", "PS2",
+     {'purchased': {'acquisition_date': "2024-01-01"},
+      'for_sale': {'asking_price': 25.99, 'notes': "Great condition"}},
+     {'is_for_sale': True, 'asking_price': 25.99, 'sale_notes': 'Great condition'}),
+]
+SINGLE_GAME_IDS = ['purchased', 'wishlist', 'lent', 'for-sale']
+
+# Every test starts from a fresh copy of the session's schema-only database and shares the
+# session's app and test client (see conftest.py). The copy's sqlite_sequence is empty, so
+# the first row a test inserts into a table gets id 1.
+pytestmark = pytest.mark.usefixtures('db')
 
 
 @pytest.fixture
-def app():
-    """Create application for testing"""
-    # Create a temporary database file
-    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+def seed_cursor(db, db_connection):
+    """Cursor on the session's autocommit connection for seeding rows the test reads back through the app"""
+    cursor = db_connection.cursor()
+    yield cursor
+    cursor.close()
+
+
+def insert_row(cursor, table, values):
+    """Insert one row given as a {column: value} dict and return its id"""
+    columns = ', '.join(values)
+    placeholders = ', '.join('?' * len(values))
+    cursor.execute(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", tuple(values.values()))
+    return cursor.lastrowid
+
+
+@functools.lru_cache(maxsize=32)
+def multi_row_insert_sql(table, columns, row_count):
+    """INSERT statement for `columns` (a tuple of names) with `row_count` VALUES tuples"""
+    row = '(' + ', '.join('?' * len(columns)) + ')'
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ', '.join([row] * row_count)
+
+
+def insert_rows(cursor, table, columns, rows):
+    """Insert rows with multi-row INSERTs, as many rows per statement as the parameter limit allows"""
+    chunk_size = MAX_SQL_VARIABLES // len(columns)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        cursor.execute(multi_row_insert_sql(table, columns, len(chunk)),
+                       [value for row in chunk for value in row])
+
+
+def seed_game(cursor, name, console, *, purchased=None, wanted=None, lent=None, for_sale=None):
+    """
+    Insert a physical game and its related rows in one BEGIN IMMEDIATE transaction.
+    `purchased` and `wanted` are column dicts for the game's purchased_games/wanted_games rows;
+    `lent` and `for_sale` are column dicts for rows attached to the purchase.
+    Returns the physical game id.
+    """
+    with immediate_transaction(cursor.connection):
+        physical_game_id = cursor.execute(
+            "INSERT INTO physical_games (name, console) VALUES (?, ?)", (name, console)
+        ).lastrowid
+        if wanted is not None:
+            insert_row(cursor, 'wanted_games', {'physical_game': physical_game_id, **wanted})
+        if purchased is not None:
+            purchased_game_id = insert_row(cursor, 'purchased_games', {'physical_game': physical_game_id, **purchased})
+            if lent is not None:
+                insert_row(cursor, 'lent_games', {'purchased_game': purchased_game_id, **lent})
+            if for_sale is not None:
+                insert_row(cursor, 'games_for_sale', {'purchased_game_id': purchased_game_id, **for_sale})
+    return physical_game_id
+
+
+@contextmanager
+def assert_query_count(expected):
+    """
+    Fail unless connections opened by app.routes run exactly `expected` SQL statements inside the block.
+    Only the routes module's `sqlite3` name is swapped, so service and fixture connections aren't counted.
+    """
+    statements = []
+    connect = sqlite3.connect
+    
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+    
+    # Patching app.routes.sqlite3.connect would replace connect on the sqlite3 module itself
+    traced_sqlite3 = SimpleNamespace(**{**vars(sqlite3), 'connect': traced_connect})
+    with patch('app.routes.sqlite3', traced_sqlite3):
+        yield
+    assert len(statements) == expected, statements
+
+
+def get_game(app, game_id):
+    """GET /api/game/<id> by dispatching inside a request context, without the test client's WSGI round trip"""
+    with app.test_request_context(f'/api/game/{game_id}'):
+        return app.full_dispatch_request()
+
+
+# Tests for selective game data refresh
+
+@pytest.mark.parametrize(('name', 'console', 'seed', 'expected'), SINGLE_GAME_SCENARIOS,
+                         ids=SINGLE_GAME_IDS)
+def test_get_single_game(app, seed_cursor, name, console, seed, expected):
+    """Test GET /api/game/<id> endpoint for a collection, wishlist, lent and for-sale game"""
+    physical_game_id = seed_game(seed_cursor, name, console, **seed)
     
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['DATABASE_PATH'] = db_path
+    # Test the API endpoint; all of a game's data comes from one query
+    with assert_query_count(1):
+        response = get_game(app, physical_game_id)
+    assert response.status_code == 200
     
-    # Initialize the database with production schema
-    with app.app_context():
-        init_test_db()
+    data = response.get_json()
+    assert 'game' in data
+    game = data['game']
     
-    yield app
+    # Compare types too: 0 == False, so a bare dict == would accept integer flags for JSON booleans
+    expected = {'id': physical_game_id, 'name': name, 'console': console, **expected}
+    assert ({field: (type(game[field]), game[field]) for field in expected}
+            == {field: (type(value), value) for field, value in expected.items()})
+
+
+def test_get_single_game_api_endpoint_not_found(app):
+    """Test GET /api/game/<id> endpoint with non-existent game"""
+    response = get_game(app, 99999)
+    assert response.status_code == 404
     
-    # Cleanup
-    os.close(db_fd)
-    os.unlink(db_path)
+    data = response.get_json()
+    assert 'error' in data
+    assert data['error'] == 'Game not found'
 
 
-def init_test_db():
-    """Initialize test database using production schema"""
-    from app.routes import get_db_path
-    import sqlite3
+# Tests for batch refresh
+
+def test_batch_refresh_success_multiple_games(client, seed_cursor):
+    """Test batch refresh with multiple valid games"""
+    # Create multiple games in one transaction; the reset database hands out ids from 1
+    game_ids = list(range(1, 4))
+    with immediate_transaction(seed_cursor.connection):
+        # Insert multiple physical games
+        insert_rows(seed_cursor, 'physical_games', ('name', 'console'),
+                    [(f"Game {i+1}", f"Console {i+1}") for i in range(3)])
+        
+        # Insert purchased games
+        insert_rows(seed_cursor, 'purchased_games', ('physical_game', 'acquisition_date', 'price'),
+                    [(physical_game_id, "2024-01-01", 29.99 + i) for i, physical_game_id in enumerate(game_ids)])
     
-    schema_path = Path(__file__).parent.parent / "test_schema.sql"
+    # Test batch refresh API
+    response = client.post('/api/games/batch-refresh',
+        json={'game_ids': game_ids}
+    )
     
-    # Connect to the in-memory database
-    conn = sqlite3.connect(get_db_path())
+    assert response.status_code == 200
+    data = response.get_json()
     
-    try:
-        # Execute the schema SQL
-        with open(schema_path, 'r') as f:
-            schema_sql = f.read()
-        
-        # Execute each statement (split by semicolons, filter empty)
-        statements = [stmt.strip() for stmt in schema_sql.split(';') if stmt.strip()]
-        for statement in statements:
-            conn.execute(statement)
-        
-        conn.commit()
-    finally:
-        conn.close()
+    assert 'games' in data
+    assert 'missing_game_ids' in data
+    assert data['found_count'] == 3
+    assert data['missing_count'] == 0
+    assert len(data['games']) == 3
+    
+    # Verify game data structure
+    for i, game in enumerate(data['games']):
+        assert game['id'] == game_ids[i]
+        assert game['name'] == f'Game {i+1}'
+        assert game['console'] == f'Console {i+1}'
+        assert game['purchase_price'] == 29.99 + i
 
 
-@pytest.fixture
-def client(app):
-    """Create a test client for the app"""
-    return app.test_client()
+def test_batch_refresh_with_missing_games(client, seed_cursor):
+    """Test batch refresh when some games don't exist"""
+    # Create one game; the endpoint finds physical games with no purchase or wishlist row too
+    existing_game_id = seed_game(seed_cursor, "Existing Game", "Test Console")
+    
+    # Request batch with existing and non-existing games
+    game_ids = [existing_game_id, 99999, 99998]
+    response = client.post('/api/games/batch-refresh',
+        json={'game_ids': game_ids}
+    )
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    
+    assert data['found_count'] == 1
+    assert data['missing_count'] == 2
+    assert len(data['games']) == 1
+    assert len(data['missing_game_ids']) == 2
+    
+    # Verify found game
+    assert data['games'][0]['id'] == existing_game_id
+    assert data['games'][0]['name'] == 'Existing Game'
+    
+    # Verify missing games
+    assert 99999 in data['missing_game_ids']
+    assert 99998 in data['missing_game_ids']
+
 
+def test_batch_refresh_invalid_request_data(client):
+    """Test batch refresh with invalid request data"""
+    # Missing game_ids
+    response = client.post('/api/games/batch-refresh', json={})
+    assert response.status_code == 400
+    data = response.get_json()
+    assert 'error' in data
+    
+    # Non-array game_ids
+    response = client.post('/api/games/batch-refresh', json={'game_ids': 'not-an-array'})
+    assert response.status_code == 400
+    
+    # Empty game_ids array
+    response = client.post('/api/games/batch-refresh', json={'game_ids': []})
+    assert response.status_code == 400
+    
+    # Too many game_ids (over limit)
+    large_array = list(range(101))  # 101 items, over the limit of 100
+    response = client.post('/api/games/batch-refresh', json={'game_ids': large_array})
+    assert response.status_code == 400
+    data = response.get_json()
+    assert 'Maximum 100 games' in data['error']
 
 
-class TestSelectiveGameRefresh:
-    """Test suite for selective game data refresh functionality"""
+def test_batch_refresh_mixed_game_types(client, seed_cursor):
+    """Test batch refresh with wishlist and collection games"""
+    wishlist_game_id = seed_game(seed_cursor, "Wishlist Game", "N64", wanted={'condition': "CIB"})
+    collection_game_id = seed_game(
+        seed_cursor, "Collection Game", "GameCube",
+        purchased={'acquisition_date': "2024-01-01", 'price': 24.99}
+    )
     
-    def test_get_single_game_api_endpoint_success(self, client):
-        """Test new GET /api/game/<id> endpoint with valid game"""
-        # First create a physical game
-        with client.application.app_context():
-            from app.routes import get_db
-            with get_db() as db:
-                cursor = db.cursor()
-                
-                # Insert physical game
-                cursor.execute(
-                    "INSERT INTO physical_games (name, console) VALUES (?, ?)",
-                    ("Test Game", "Test Console")
-                )
-                physical_game_id = cursor.lastrowid
-                
-                # Insert purchased game
-                cursor.execute(
-                    "INSERT INTO purchased_games (physical_game, acquisition_date, source, price, condition) VALUES (?, ?, ?, ?, ?)",
-                    (physical_game_id, "2024-01-01", "Test Store", 29.99, "complete")
-                )
-                
-                db.commit()
-        
-        # Test the API endpoint
-        response = client.get(f'/api/game/{physical_game_id}')
-        assert response.status_code == 200
-        
-        data = json.loads(response.data)
-        assert 'game' in data
-        game = data['game']
-        
-        # Verify game data structure
-        assert game['id'] == physical_game_id
-        assert game['name'] == 'Test Game'
-        assert game['console'] == 'Test Console'
-        assert game['condition'] == 'complete'
-        assert game['purchase_price'] == 29.99
-        assert game['source_name'] is None  # No source record created
-        assert game['is_wanted'] is False
-        assert game['is_lent'] is False
-        assert game['is_for_sale'] is False
+    # Test batch refresh with both types
+    response = client.post('/api/games/batch-refresh',
+        json={'game_ids': [wishlist_game_id, collection_game_id]}
+    )
     
-    def test_get_single_game_api_endpoint_not_found(self, client):
-        """Test GET /api/game/<id> endpoint with non-existent game"""
-        response = client.get('/api/game/99999')
-        assert response.status_code == 404
-        
-        data = json.loads(response.data)
-        assert 'error' in data
-        assert data['error'] == 'Game not found'
+    assert response.status_code == 200
+    data = response.get_json()
     
-    def test_get_single_game_wishlist_item(self, client):
-        """Test GET /api/game/<id> endpoint with wishlist item"""
-        # Create a wishlist item
-        with client.application.app_context():
-            from app.routes import get_db
-            with get_db() as db:
-                cursor = db.cursor()
-                
-                # Insert physical game
-                cursor.execute(
-                    "INSERT INTO physical_games (name, console) VALUES (?, ?)",
-                    ("Wishlist Game", "N64")
-                )
-                physical_game_id = cursor.lastrowid
-                
-                # Insert wanted game (wishlist)
-                cursor.execute(
-                    "INSERT INTO wanted_games (physical_game, condition) VALUES (?, ?)",
-                    (physical_game_id, "CIB")
-                )
-                
-                db.commit()
-        
-        # Test the API endpoint
-        response = client.get(f'/api/game/{physical_game_id}')
-        assert response.status_code == 200
-        
-        data = json.loads(response.data)
-        game = data['game']
-        
-        assert game['name'] == 'Wishlist Game'
-        assert game['console'] == 'N64'
-        assert game['condition'] == 'CIB'
-        assert game['is_wanted'] is True
-        assert game['purchase_price'] is None
-        assert game['purchased_game_id'] is None
+    assert data['found_count'] == 2
+    assert data['missing_count'] == 0
     
-    def test_get_single_game_with_lent_status(self, client):
-        """Test GET /api/game/<id> endpoint with lent out game"""
-        # Create a game that's lent out
-        with client.application.app_context():
-            from app.routes import get_db
-            with get_db() as db:
-                cursor = db.cursor()
-                
-                # Insert physical game
-                cursor.execute(
-                    "INSERT INTO physical_games (name, console) VALUES (?, ?)",
-                    ("Lent Game", "GameCube")
-                )
-                physical_game_id = cursor.lastrowid
-                
-                # Insert purchased game
-                cursor.execute(
-                    "INSERT INTO purchased_games (physical_game, acquisition_date, price) VALUES (?, ?, ?)",
-                    (physical_game_id, "2024-01-01", 39.99)
-                )
-                purchased_game_id = cursor.lastrowid
-                
-                # Insert lent status
-                cursor.execute(
-                    "INSERT INTO lent_games (purchased_game, lent_date, lent_to, note) VALUES (?, ?, ?, ?)",
-                    (purchased_game_id, "2024-02-01", "Friend Name", "Test note")
-                )
-                
-                db.commit()
-        
-        # Test the API endpoint
-        response = client.get(f'/api/game/{physical_game_id}')
-        assert response.status_code == 200
-        
-        data = json.loads(response.data)
-        game = data['game']
-        
-        assert game['name'] == 'Lent Game'
-        assert game['is_lent'] is True
-        assert game['lent_date'] == '2024-02-01'
-        assert game['lent_to'] == 'Friend Name'
-        assert game['lent_note'] == 'Test note'
+    # Find games by name to verify properties
+    games_by_name = {game['name']: game for game in data['games']}
     
-    def test_get_single_game_with_sale_status(self, client):
-        """Test GET /api/game/<id> endpoint with game marked for sale"""
-        # Create a game that's for sale
-        with client.application.app_context():
-            from app.routes import get_db
-            with get_db() as db:
-                cursor = db.cursor()
-                
-                # Insert physical game
-                cursor.execute(
-                    "INSERT INTO physical_games (name, console) VALUES (?, ?)",
-                    ("Sale Game", "PS2")
-                )
-                physical_game_id = cursor.lastrowid
-                
-                # Insert purchased game
-                cursor.execute(
-                    "INSERT INTO purchased_games (physical_game, acquisition_date, price) VALUES (?, ?, ?)",
-                    (physical_game_id, "2024-01-01", 19.99)
-                )
-                purchased_game_id = cursor.lastrowid
-                
-                # Insert sale status
-                cursor.execute(
-                    "INSERT INTO games_for_sale (purchased_game_id, asking_price, notes) VALUES (?, ?, ?)",
-                    (purchased_game_id, 25.99, "Great condition")
-                )
-                
-                db.commit()
-        
-        # Test the API endpoint
-        response = client.get(f'/api/game/{physical_game_id}')
-        assert response.status_code == 200
-        
-        data = json.loads(response.data)
-        game = data['game']
-        
-        assert game['name'] == 'Sale Game'
-        assert game['is_for_sale'] is True
-        assert game['asking_price'] == 25.99
-        assert game['sale_notes'] == 'Great condition'
+    # Verify wishlist game
+    wishlist_game = games_by_name['Wishlist Game']
+    assert wishlist_game['is_wanted'] is True
+    assert wishlist_game['purchase_price'] is None
+    assert wishlist_game['condition'] == 'CIB'
+    
+    # Verify collection game
+    collection_game = games_by_name['Collection Game']
+    assert collection_game['is_wanted'] is False
+    assert collection_game['purchase_price'] == 24.99
 
 
-class TestBatchRefreshOperations:
-    """Test suite for batch refresh functionality"""
+def test_batch_refresh_large_batch_within_limits(client, seed_cursor):
+    """Test batch refresh with a large but valid batch size"""
+    # Create 50 games (within the 100 game limit), generating the rows inside SQLite
+    with immediate_transaction(seed_cursor.connection):
+        seed_cursor.execute("""
+            INSERT INTO physical_games (name, console)
+                WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < 49)
+                SELECT 'Batch Game ' || i, 'Test Console' FROM n
+        """)
+        seed_cursor.execute("""
+            INSERT INTO purchased_games (physical_game, acquisition_date, price)
+                SELECT id, '2024-01-01', 9.00 + id FROM physical_games
+        """)
+    # The reset database hands out ids from 1
+    game_ids = list(range(1, 51))
     
-    def test_batch_refresh_success_multiple_games(self, client):
-        """Test batch refresh with multiple valid games"""
-        # Create multiple games
-        game_ids = []
-        with client.application.app_context():
-            from app.routes import get_db
-            with get_db() as db:
-                cursor = db.cursor()
-                
-                # Insert multiple physical games
-                for i, name in enumerate(['Game 1', 'Game 2', 'Game 3']):
-                    cursor.execute(
-                        "INSERT INTO physical_games (name, console) VALUES (?, ?)",
-                        (name, f"Console {i+1}")
-                    )
-                    physical_game_id = cursor.lastrowid
-                    game_ids.append(physical_game_id)
-                    
-                    # Insert purchased games
-                    cursor.execute(
-                        "INSERT INTO purchased_games (physical_game, acquisition_date, price) VALUES (?, ?, ?)",
-                        (physical_game_id, "2024-01-01", 29.99 + i)
-                    )
-                
-                db.commit()
-        
-        # Test batch refresh API
+    # Test batch refresh; the whole batch is fetched in one query
+    with assert_query_count(1):
         response = client.post('/api/games/batch-refresh',
             json={'game_ids': game_ids}
         )
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        
-        assert 'games' in data
-        assert 'missing_game_ids' in data
-        assert data['found_count'] == 3
-        assert data['missing_count'] == 0
-        assert len(data['games']) == 3
-        
-        # Verify game data structure
-        for i, game in enumerate(data['games']):
-            assert game['id'] == game_ids[i]
-            assert game['name'] == f'Game {i+1}'
-            assert game['console'] == f'Console {i+1}'
-            assert game['purchase_price'] == 29.99 + i
     
-    def test_batch_refresh_with_missing_games(self, client):
-        """Test batch refresh when some games don't exist"""
-        # Create one game
-        with client.application.app_context():
-            from app.routes import get_db
-            with get_db() as db:
-                cursor = db.cursor()
-                
-                cursor.execute(
-                    "INSERT INTO physical_games (name, console) VALUES (?, ?)",
-                    ("Existing Game", "Test Console")
-                )
-                existing_game_id = cursor.lastrowid
-                
-                cursor.execute(
-                    "INSERT INTO purchased_games (physical_game, acquisition_date, price) VALUES (?, ?, ?)",
-                    (existing_game_id, "2024-01-01", 39.99)
-                )
-                
-                db.commit()
-        
-        # Request batch with existing and non-existing games
-        game_ids = [existing_game_id, 99999, 99998]
-        response = client.post('/api/games/batch-refresh',
-            json={'game_ids': game_ids}
-        )
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        
-        assert data['found_count'] == 1
-        assert data['missing_count'] == 2
-        assert len(data['games']) == 1
-        assert len(data['missing_game_ids']) == 2
-        
-        # Verify found game
-        assert data['games'][0]['id'] == existing_game_id
-        assert data['games'][0]['name'] == 'Existing Game'
-        
-        # Verify missing games
-        assert 99999 in data['missing_game_ids']
-        assert 99998 in data['missing_game_ids']
-    
-    def test_batch_refresh_invalid_request_data(self, client):
-        """Test batch refresh with invalid request data"""
-        # Missing game_ids
-        response = client.post('/api/games/batch-refresh', json={})
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert 'error' in data
-        
-        # Non-array game_ids
-        response = client.post('/api/games/batch-refresh', json={'game_ids': 'not-an-array'})
-        assert response.status_code == 400
-        
-        # Empty game_ids array
-        response = client.post('/api/games/batch-refresh', json={'game_ids': []})
-        assert response.status_code == 400
-        
-        # Too many game_ids (over limit)
-        large_array = list(range(101))  # 101 items, over the limit of 100
-        response = client.post('/api/games/batch-refresh', json={'game_ids': large_array})
-        assert response.status_code == 400
-        data = json.loads(response.data)
-        assert 'Maximum 100 games' in data['error']
+    assert response.status_code == 200
+    data = response.get_json()
     
-    def test_batch_refresh_mixed_game_types(self, client):
-        """Test batch refresh with wishlist and collection games"""
-        with client.application.app_context():
-            from app.routes import get_db
-            with get_db() as db:
-                cursor = db.cursor()
-                
-                # Create wishlist game
-                cursor.execute(
-                    "INSERT INTO physical_games (name, console) VALUES (?, ?)",
-                    ("Wishlist Game", "N64")
-                )
-                wishlist_game_id = cursor.lastrowid
-                
-                cursor.execute(
-                    "INSERT INTO wanted_games (physical_game, condition) VALUES (?, ?)",
-                    (wishlist_game_id, "CIB")
-                )
-                
-                # Create collection game
-                cursor.execute(
-                    "INSERT INTO physical_games (name, console) VALUES (?, ?)",
-                    ("Collection Game", "GameCube")
-                )
-                collection_game_id = cursor.lastrowid
-                
-                cursor.execute(
-                    "INSERT INTO purchased_games (physical_game, acquisition_date, price) VALUES (?, ?, ?)",
-                    (collection_game_id, "2024-01-01", 24.99)
-                )
-                
-                db.commit()
-        
-        # Test batch refresh with both types
-        response = client.post('/api/games/batch-refresh',
-            json={'game_ids': [wishlist_game_id, collection_game_id]}
-        )
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        
-        assert data['found_count'] == 2
-        assert data['missing_count'] == 0
-        
-        # Find games by name to verify properties
-        games_by_name = {game['name']: game for game in data['games']}
-        
-        # Verify wishlist game
-        wishlist_game = games_by_name['Wishlist Game']
-        assert wishlist_game['is_wanted'] is True
-        assert wishlist_game['purchase_price'] is None
-        assert wishlist_game['condition'] == 'CIB'
-        
-        # Verify collection game
-        collection_game = games_by_name['Collection Game']
-        assert collection_game['is_wanted'] is False
-        assert collection_game['purchase_price'] == 24.99
+    assert data['found_count'] == 50
+    assert data['missing_count'] == 0
+    assert len(data['games']) == 50
     
-    def test_batch_refresh_large_batch_within_limits(self, client):
-        """Test batch refresh with a large but valid batch size"""
-        # Create 50 games (within the 100 game limit)
-        game_ids = []
-        with client.application.app_context():
-            from app.routes import get_db
-            with get_db() as db:
-                cursor = db.cursor()
-                
-                for i in range(50):
-                    cursor.execute(
-                        "INSERT INTO physical_games (name, console) VALUES (?, ?)",
-                        (f"Batch Game {i}", "Test Console")
-                    )
-                    physical_game_id = cursor.lastrowid
-                    game_ids.append(physical_game_id)
-                    
-                    cursor.execute(
-                        "INSERT INTO purchased_games (physical_game, acquisition_date, price) VALUES (?, ?, ?)",
-                        (physical_game_id, "2024-01-01", 10.00 + i)
-                    )
-                
-                db.commit()
-        
-        # Test batch refresh
-        response = client.post('/api/games/batch-refresh',
-            json={'game_ids': game_ids}
-        )
-        
-        assert response.status_code == 200
-        data = json.loads(response.data)
-        
-        assert data['found_count'] == 50
-        assert data['missing_count'] == 0
-        assert len(data['games']) == 50
-        
-        # Verify games are returned in order
-        for i, game in enumerate(data['games']):
-            assert game['name'] == f'Batch Game {i}'
-            assert game['purchase_price'] == 10.00 + i
+    # Verify games are returned in order
+    for i, game in enumerate(data['games']):
+        assert game['name'] == f'Batch Game {i}'
+        assert game['purchase_price'] == 10.00 + i
 
 
 if __name__ == '__main__':
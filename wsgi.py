@@ -2,12 +2,26 @@
 """
 Main application entry point for self-hosted deployment
 """
-from app import create_app
+import functools
 import os
 
-app = create_app()
+
+@functools.lru_cache(maxsize=None)
+def get_app():
+    """Create the application on first use"""
+    from app import create_app
+    return create_app()
+
+
+def __getattr__(name):
+    # Build `app` lazily (PEP 562) so importing this module doesn't create it; gunicorn's
+    # `wsgi:app` looks the attribute up with getattr, which lands here
+    if name == 'app':
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == '__main__':
     # For development
     port = int(os.environ.get('FLASK_RUN_PORT', 8082))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    get_app().run(host='0.0.0.0', port=port, debug=True)